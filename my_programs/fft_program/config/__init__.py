@@ -7,11 +7,13 @@ from config.settings import (
     AudioSettings,
     FrequencySettings,
     OverflowSettings,
+    PeakColorMode,
     PeakSettings,
     ColorSettings,
     SensitivitySettings,
     ScalingSettings,
     SmoothingSettings,
+    DualSettings,
     Settings,
     load_settings,
     get_default_settings,
@@ -21,11 +23,13 @@ __all__ = [
     'AudioSettings',
     'FrequencySettings',
     'OverflowSettings',
+    'PeakColorMode',
     'PeakSettings',
     'ColorSettings',
     'SensitivitySettings',
     'ScalingSettings',
     'SmoothingSettings',
+    'DualSettings',
     'Settings',
     'load_settings',
     'get_default_settings',
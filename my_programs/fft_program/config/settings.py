@@ -4,7 +4,8 @@ Configuration settings for FFT visualizer.
 All user-configurable parameters are defined here as dataclasses.
 """
 from dataclasses import dataclass, field
-from typing import Tuple, Literal, List
+from enum import IntEnum
+from typing import Tuple, List, Optional, Union
 
 
 @dataclass
@@ -73,13 +74,56 @@ class OverflowSettings:
     color_3: Tuple[int, int, int] = (255, 255, 255)    # 4th+ layer color (magenta)
 
 
+class PeakColorMode(IntEnum):
+    """Peak indicator color mode (int-valued so per-pixel checks are int compares)."""
+    WHITE = 0      # Always white
+    BAR = 1        # Matches bar color
+    CONTRAST = 2   # Inverted bar color
+    PEAK = 3       # Color at max height
+    
+    @classmethod
+    def parse(
+        cls,
+        value: Union[str, int],
+        default: Optional['PeakColorMode'] = None
+    ) -> 'PeakColorMode':
+        """
+        Convert a mode name ('contrast') or int into a PeakColorMode.
+        
+        Args:
+            value: Mode name (case-insensitive) or integer value
+            default: Returned for unknown values instead of raising
+        
+        Returns:
+            Matching PeakColorMode
+        
+        Raises:
+            ValueError: If value is unknown and no default is given
+        """
+        try:
+            if isinstance(value, str):
+                return cls[value.upper()]
+            return cls(value)
+        except (KeyError, ValueError):
+            if default is not None:
+                return default
+            raise ValueError(f"Unknown peak color mode: {value!r}")
+
+
 @dataclass
 class PeakSettings:
     """Peak indicator configuration."""
     enabled: bool = False      # True = show floating peak dots above bars
     fall_speed: float = 0.08   # How fast peaks fall (0.01 = slow, 0.2 = fast)
     hold_frames: int = 8       # Frames to hold peak before falling
-    color_mode: Literal['white', 'bar', 'contrast', 'peak'] = 'contrast'
+    color_mode: PeakColorMode = PeakColorMode.CONTRAST  # Also accepts 'white', 'bar', 'contrast', 'peak'
+    
+    def __setattr__(self, name, value):
+        # Settings files store the mode by name; normalize on every assignment
+        # (not just __init__) so the theme only ever sees a PeakColorMode
+        if name == 'color_mode':
+            value = PeakColorMode.parse(value)
+        super().__setattr__(name, value)
 
 
 @dataclass
@@ -135,6 +179,13 @@ class ShadowSettings:
     decay_interval: int = 3        # Decay every N frames (1 = every frame, 5 = every 5th)
 
 
+@dataclass
+class DualSettings:
+    """Dual-layer bars configuration (bars_dual visualizer)."""
+    enabled: bool = False              # True = draw the top layer over the base bars
+    top_color_mode: str = 'overflow'   # 'overflow' (base theme overflow colors) or a theme name
+
+
 @dataclass
 class LayerConfig:
     """
@@ -209,6 +260,7 @@ class Settings:
     scaling: ScalingSettings = field(default_factory=ScalingSettings)
     smoothing: SmoothingSettings = field(default_factory=SmoothingSettings)
     shadow: ShadowSettings = field(default_factory=ShadowSettings)
+    dual: DualSettings = field(default_factory=DualSettings)
     layers: LayeredVisualizerSettings = field(default_factory=LayeredVisualizerSettings)
 
 
@@ -261,6 +313,8 @@ def load_settings(path: str = None) -> Settings:
             settings.scaling = ScalingSettings(**data['scaling'])
         if 'smoothing' in data:
             settings.smoothing = SmoothingSettings(**data['smoothing'])
+        if 'dual' in data:
+            settings.dual = DualSettings(**data['dual'])
         
         return settings
     
@@ -284,6 +338,8 @@ def save_settings(settings: Settings, path: str) -> None:
     from dataclasses import asdict
     
     data = asdict(settings)
+    # Store the peak color mode by name, matching hand-written settings files
+    data['peak']['color_mode'] = settings.peak.color_mode.name.lower()
     
     with open(path, 'w') as f:
         json.dump(data, f, indent=2)
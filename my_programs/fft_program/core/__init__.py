@@ -5,11 +5,17 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.audio import AudioProcessor, FFTData
 from core.scaling import ScalingProcessor
+from core.kernels import NUMBA_AVAILABLE
 from core.matrix_app import MatrixApp
+from core.pacing import FramePacer
+from core.pipeline import AnalysisWorker
 
 __all__ = [
     'AudioProcessor',
     'FFTData',
     'ScalingProcessor',
+    'NUMBA_AVAILABLE',
     'MatrixApp',
+    'FramePacer',
+    'AnalysisWorker',
 ]
@@ -5,12 +5,18 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import threading
 import numpy as np  # type: ignore
 from dataclasses import dataclass
 from typing import List, Optional, Callable, Tuple
 import sounddevice as sd  # type: ignore
 
 from config.settings import AudioSettings, FrequencySettings, SensitivitySettings
+from core.kernels import NUMBA_AVAILABLE, ROCKET_FFT_AVAILABLE, spectrum_magnitude, bin_bars
+
+# Capture ring depth: the callback writes one slot while readers use the last
+# completed one, so a reader is safe for (slots - 1) audio blocks
+_RING_SLOTS = 3
 
 
 @dataclass
@@ -63,6 +69,15 @@ class AudioProcessor:
         self.have_data: bool = False
         self.sample_rate: int = 0
         
+        # Preallocated capture ring (initialized in setup())
+        self._ring: Optional[np.ndarray] = None
+        self._ring_slot: int = 0
+        self._data_ready = threading.Event()
+        
+        # Guards bin layout and FFT scratch buffers: bars may be computed on
+        # a worker thread while key handlers change the frequency range
+        self._lock = threading.Lock()
+        
         # FFT state (initialized in setup())
         self.freqs: Optional[np.ndarray] = None
         self.bin_masks: List[np.ndarray] = []
@@ -70,16 +85,24 @@ class AudioProcessor:
         self.window: Optional[np.ndarray] = None
         
         # Optimized bin lookup (initialized in setup())
-        self.bin_indices: Optional[List[np.ndarray]] = None  # Pre-computed indices for each bin
+        # Frequencies are sorted, so each bin is a contiguous [start, end) range
+        self.bin_starts: Optional[np.ndarray] = None
+        self.bin_ends: Optional[np.ndarray] = None
+        self.bin_scale: Optional[np.ndarray] = None   # weight / width (0 for empty bins)
         self.empty_bins: Optional[np.ndarray] = None  # Mask for bins with no frequency coverage
         
+        # Preallocated FFT scratch buffers (initialized in setup())
+        self._windowed: Optional[np.ndarray] = None
+        self._mag: Optional[np.ndarray] = None
+        self._mag_csum: Optional[np.ndarray] = None
+        
         # Stream (initialized in start())
         self._stream: Optional[sd.InputStream] = None
         
         # Layer mode state (initialized in setup_layers())
         self.layers_enabled: bool = False
         self.num_layers: int = 0
-        self.layer_indices: List[List[np.ndarray]] = []  # Per-layer bin indices
+        self.layer_ranges: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []  # Per-layer (starts, ends, scale)
         self.layer_weights: List[np.ndarray] = []        # Per-layer frequency weights
         self.layer_empty: List[np.ndarray] = []          # Per-layer empty bin masks
         self.layer_bins: List[int] = []                  # Per-layer bin counts
@@ -110,16 +133,23 @@ class AudioProcessor:
         print(f"{mode}: {freq_min} Hz - {freq_max} Hz")
         
         # Initialize FFT parameters
-        self.latest_samples = np.zeros(self.audio_settings.block_size, dtype=np.float32)
+        self._ring = np.zeros((_RING_SLOTS, self.audio_settings.block_size), dtype=np.float32)
+        self._ring_slot = 0
+        self.latest_samples = self._ring[0]
         self.freqs = np.fft.rfftfreq(self.audio_settings.fft_size, 1 / self.sample_rate)
         self.bin_masks, self.bin_weights = self._create_frequency_bins(
             self.freqs, freq_min, freq_max, self.num_bins
         )
         self.window = np.hanning(self.audio_settings.block_size)
+        self._windowed = np.zeros(self.audio_settings.block_size, dtype=np.float64)
+        self._mag = np.zeros(len(self.freqs), dtype=np.float64)
+        self._mag_csum = np.zeros(len(self.freqs) + 1, dtype=np.float64)
         
-        # Pre-compute bin indices for vectorized magnitude calculation
-        self.bin_indices = [np.where(mask)[0] for mask in self.bin_masks]
-        self.empty_bins = np.array([len(idx) == 0 for idx in self.bin_indices])
+        # Pre-compute bin ranges for vectorized magnitude calculation
+        self.bin_starts, self.bin_ends, self.bin_scale = self._bin_ranges(
+            self.bin_masks, self.bin_weights
+        )
+        self.empty_bins = self.bin_starts == self.bin_ends
         
         # Check bin coverage
         empty_count = np.sum(self.empty_bins)
@@ -138,13 +168,17 @@ class AudioProcessor:
         freq_min = self.freq_settings.active_min_freq
         freq_max = self.freq_settings.active_max_freq
         
-        self.bin_masks, self.bin_weights = self._create_frequency_bins(
+        bin_masks, bin_weights = self._create_frequency_bins(
             self.freqs, freq_min, freq_max, self.num_bins
         )
         
-        # Re-compute bin indices
-        self.bin_indices = [np.where(mask)[0] for mask in self.bin_masks]
-        self.empty_bins = np.array([len(idx) == 0 for idx in self.bin_indices])
+        # Re-compute bin ranges
+        starts, ends, scale = self._bin_ranges(bin_masks, bin_weights)
+        
+        with self._lock:
+            self.bin_masks, self.bin_weights = bin_masks, bin_weights
+            self.bin_starts, self.bin_ends, self.bin_scale = starts, ends, scale
+            self.empty_bins = starts == ends
         
         # Warn about empty bins
         empty_count = np.sum(self.empty_bins)
@@ -161,12 +195,10 @@ class AudioProcessor:
         if self.freqs is None:
             raise RuntimeError("Call setup() before setup_layers()")
         
-        self.layers_enabled = True
-        self.num_layers = len(layer_configs)
-        self.layer_indices = []
-        self.layer_weights = []
-        self.layer_empty = []
-        self.layer_bins = []
+        layer_ranges = []
+        layer_weights = []
+        layer_empty = []
+        layer_bins = []
         
         # Global frequency range for proper weighting (20Hz - 20kHz audible spectrum)
         global_fmin = 20.0
@@ -181,16 +213,24 @@ class AudioProcessor:
                 self.freqs, fmin, fmax, bins, global_fmin, global_fmax
             )
             
-            indices = [np.where(mask)[0] for mask in masks]
-            empty = np.array([len(idx) == 0 for idx in indices])
+            starts, ends, scale = self._bin_ranges(masks, weights)
+            empty = starts == ends
             
-            self.layer_indices.append(indices)
-            self.layer_weights.append(weights)
-            self.layer_empty.append(empty)
-            self.layer_bins.append(bins)
+            layer_ranges.append((starts, ends, scale))
+            layer_weights.append(weights)
+            layer_empty.append(empty)
+            layer_bins.append(bins)
             
             empty_count = np.sum(empty)
             print(f"Layer {i} '{config.name}': {fmin}-{fmax}Hz ({bins} bins, {empty_count} empty)")
+        
+        with self._lock:
+            self.num_layers = len(layer_configs)
+            self.layer_ranges = layer_ranges
+            self.layer_weights = layer_weights
+            self.layer_empty = layer_empty
+            self.layer_bins = layer_bins
+            self.layers_enabled = True
     
     def get_layer_magnitudes(self) -> Optional[List[np.ndarray]]:
         """
@@ -205,26 +245,47 @@ class AudioProcessor:
         if not self.layers_enabled:
             return None
         
-        # Apply window and compute FFT with zero-padding (done ONCE)
-        x = self.latest_samples * self.window
-        X = np.fft.rfft(x, n=self.audio_settings.fft_size)
-        mag = np.abs(X)
+        with self._lock:
+            # Apply window and compute FFT with zero-padding (done ONCE)
+            mag = self._compute_magnitudes()
+            return self._extract_layer_bars(mag)
+    
+    def get_all_magnitudes(self, include_layers: bool = True) -> Tuple[Optional[np.ndarray], Optional[List[np.ndarray]]]:
+        """
+        Compute FFT once and return both single-layer and per-layer bars.
         
-        # Extract bins for each layer (cheap O(bins) per layer)
-        layer_bars = []
-        for layer_idx in range(self.num_layers):
-            indices_list = self.layer_indices[layer_idx]
-            weights = self.layer_weights[layer_idx]
-            num_bins = self.layer_bins[layer_idx]
-            
-            bars = np.zeros(num_bins, dtype=np.float32)
-            for i, indices in enumerate(indices_list):
-                if len(indices) > 0:
-                    bars[i] = np.mean(mag[indices]) * weights[i]
-            
-            bars = np.maximum(0, bars - self.sensitivity_settings.noise_floor)
-            layer_bars.append(bars)
+        Args:
+            include_layers: Also extract layer bars (if layers are set up)
+        
+        Returns:
+            Tuple of (bars, layer_bars); either may be None
+        """
+        if not self.have_data or self.latest_samples is None:
+            return None, None
+        
+        with self._lock:
+            mag = self._compute_magnitudes()
+            bars = self._extract_bars(mag, self.bin_starts, self.bin_ends, self.bin_scale)
+            layer_bars = None
+            if include_layers and self.layers_enabled:
+                layer_bars = self._extract_layer_bars(mag)
         
+        return bars, layer_bars
+    
+    def _extract_layer_bars(self, mag: np.ndarray) -> List[np.ndarray]:
+        """
+        Extract bars for every layer from one set of FFT magnitudes.
+        
+        Args:
+            mag: FFT magnitudes
+        
+        Returns:
+            List of bar arrays (one per layer)
+        """
+        # Cheap O(bins) per layer
+        layer_bars = []
+        for starts, ends, scale in self.layer_ranges:
+            layer_bars.append(self._extract_bars(mag, starts, ends, scale))
         return layer_bars
     
     def _create_frequency_bins_global(
@@ -327,8 +388,27 @@ class AudioProcessor:
         """Callback function for audio input stream."""
         if status:
             print(f"Audio status: {status}")
-        self.latest_samples = indata[:, self.audio_settings.channel].copy()
+        # Fill the next ring slot in place, then publish it by reference
+        slot = self._ring[self._ring_slot]
+        slot[:] = indata[:, self.audio_settings.channel]
+        self.latest_samples = slot
+        self._ring_slot = (self._ring_slot + 1) % _RING_SLOTS
         self.have_data = True
+        self._data_ready.set()
+    
+    def wait_for_data(self, timeout: float) -> bool:
+        """
+        Block until the next audio block arrives.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            True if a new block arrived, False on timeout
+        """
+        ready = self._data_ready.wait(timeout)
+        self._data_ready.clear()
+        return ready
     
     def start(self) -> None:
         """Start the audio input stream."""
@@ -360,22 +440,91 @@ class AudioProcessor:
         if not self.have_data or self.latest_samples is None:
             return None
         
-        # Apply window and compute FFT with zero-padding
-        x = self.latest_samples * self.window
-        X = np.fft.rfft(x, n=self.audio_settings.fft_size)
-        mag = np.abs(X)
+        with self._lock:
+            # Apply window and compute FFT with zero-padding
+            mag = self._compute_magnitudes()
+            return self._extract_bars(mag, self.bin_starts, self.bin_ends, self.bin_scale)
+    
+    def _compute_magnitudes(self) -> np.ndarray:
+        """
+        Window the latest samples and compute zero-padded FFT magnitudes.
         
-        # Vectorized magnitude calculation using pre-computed bin indices
-        bars = np.zeros(self.num_bins, dtype=np.float32)
-        for i, indices in enumerate(self.bin_indices):
-            if len(indices) > 0:
-                bars[i] = np.mean(mag[indices]) * self.bin_weights[i]
+        Returns:
+            Magnitude array (preallocated buffer, overwritten on next call)
+        """
+        if ROCKET_FFT_AVAILABLE:
+            # Fused window + rfft + abs in one compiled call
+            spectrum_magnitude(
+                self.latest_samples, self.window, self.audio_settings.fft_size,
+                self._windowed, self._mag
+            )
+            return self._mag
+        
+        np.multiply(self.latest_samples, self.window, out=self._windowed)
+        X = np.fft.rfft(self._windowed, n=self.audio_settings.fft_size)
+        np.abs(X, out=self._mag)
+        return self._mag
+    
+    def _extract_bars(
+        self,
+        mag: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        scale: np.ndarray
+    ) -> np.ndarray:
+        """
+        Average magnitudes over each bin range, weight, and apply noise floor.
+        
+        Args:
+            mag: FFT magnitudes
+            starts: First magnitude index of each bin
+            ends: One past the last magnitude index of each bin
+            scale: Per-bin weight / bin width (0 for empty bins)
+        
+        Returns:
+            Array of bar values (float32)
+        """
+        bars = np.empty(len(starts), dtype=np.float32)
+        noise_floor = float(self.sensitivity_settings.noise_floor)
+        
+        if NUMBA_AVAILABLE:
+            bin_bars(mag, starts, ends, scale, noise_floor, bars)
+            return bars
+        
+        # Range sums from a prefix sum: one cumsum instead of a mean per bin
+        csum = self._mag_csum
+        np.cumsum(mag, out=csum[1:])
+        bars[:] = (csum[ends] - csum[starts]) * scale
         
         # Apply noise floor (vectorized)
-        bars = np.maximum(0, bars - self.sensitivity_settings.noise_floor)
+        bars -= noise_floor
+        np.maximum(bars, 0, out=bars)
         
         return bars
     
+    def _bin_ranges(self, masks: List[np.ndarray], weights: np.ndarray) -> tuple:
+        """
+        Convert bin masks into contiguous index ranges.
+        
+        Args:
+            masks: Boolean mask over FFT frequencies for each bin
+            weights: Frequency weight for each bin
+        
+        Returns:
+            Tuple of (starts, ends, scale) where scale is weight / bin width
+        """
+        starts = np.zeros(len(masks), dtype=np.int64)
+        ends = np.zeros(len(masks), dtype=np.int64)
+        for i, mask in enumerate(masks):
+            indices = np.flatnonzero(mask)
+            if len(indices) > 0:
+                starts[i] = indices[0]
+                ends[i] = indices[-1] + 1
+        
+        widths = ends - starts
+        scale = np.where(widths > 0, weights / np.maximum(widths, 1), 0.0)
+        return starts, ends, scale
+    
     def __enter__(self):
         """Context manager entry."""
         self.setup()
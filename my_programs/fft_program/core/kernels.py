@@ -0,0 +1,132 @@
+"""
+Compiled per-frame kernels for FFT visualizer.
+
+Uses Numba when available to fuse the per-frame array work into single
+compiled loops. Callers check NUMBA_AVAILABLE and fall back to their
+NumPy implementation otherwise.
+
+Kernels declare explicit signatures, so they compile (or load from the
+on-disk cache) at import time rather than on the first frame.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # type: ignore
+
+# Persistent compile cache, independent of whether the source tree is writable
+# (must be set before numba is imported)
+os.environ.setdefault(
+    'NUMBA_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'fft_visualizer_numba')
+)
+
+try:
+    from numba import njit  # type: ignore
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so kernels still define without Numba."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+# rocket-fft registers np.fft overloads so rfft can run inside njit code
+try:
+    import rocket_fft  # type: ignore  # noqa: F401
+    ROCKET_FFT_AVAILABLE = NUMBA_AVAILABLE
+except ImportError:
+    ROCKET_FFT_AVAILABLE = False
+
+
+@njit('void(f4[:], f8, f8, f8, i8, f8, f4[:], f4[:], f4[:], i4[:])', cache=True, fastmath=True)
+def scale_smooth_peak(
+    bars, scale, rise, fall, hold_frames, fall_speed,
+    normalized, smoothed, peaks, hold_counters
+):
+    """
+    Normalize, smooth and track peaks in one pass over the bins.
+
+    Args:
+        bars: Raw bar values (float32)
+        scale: Multiplier applied to bars (silence fade / normalization scale)
+        rise: Smoothing rate when a bar rises
+        fall: Smoothing rate when a bar falls
+        hold_frames: Frames to hold peak before falling
+        fall_speed: How fast peaks fall
+        normalized: Output buffer for normalized bars (written)
+        smoothed: Smoothed bar state (updated in place)
+        peaks: Peak height state (updated in place)
+        hold_counters: Peak hold counters (updated in place)
+    """
+    for i in range(bars.shape[0]):
+        n = bars[i] * scale
+        normalized[i] = n
+
+        # Asymmetric smoothing: fast rise, slow fall
+        delta = n - smoothed[i]
+        if delta > 0:
+            s = smoothed[i] + delta * rise
+        else:
+            s = smoothed[i] + delta * fall
+        smoothed[i] = s
+
+        # Peak hold then fall
+        if s >= peaks[i]:
+            peaks[i] = s
+            hold_counters[i] = hold_frames
+        elif hold_counters[i] > 0:
+            hold_counters[i] -= 1
+        else:
+            p = peaks[i] - fall_speed
+            peaks[i] = p if p > 0 else 0.0
+
+
+# Only defined with rocket-fft: without it np.fft.rfft cannot compile
+if ROCKET_FFT_AVAILABLE:
+    @njit('void(f4[:], f8[:], i8, f8[:], f8[:])', cache=True, fastmath=True, nogil=True)
+    def spectrum_magnitude(samples, window, fft_size, windowed, mag):
+        """
+        Window the samples, zero-padded rfft, and write magnitudes.
+
+        Requires rocket-fft (np.fft.rfft inside nopython code).
+
+        Args:
+            samples: Audio block (float32)
+            window: Window function, same length as samples
+            fft_size: FFT length (zero-padded)
+            windowed: Scratch buffer for windowed samples (written)
+            mag: Output buffer of fft_size // 2 + 1 magnitudes (written)
+        """
+        for i in range(samples.shape[0]):
+            windowed[i] = samples[i] * window[i]
+        spectrum = np.fft.rfft(windowed, fft_size)
+        for k in range(mag.shape[0]):
+            mag[k] = abs(spectrum[k])
+else:
+    spectrum_magnitude = None
+
+
+@njit('void(f8[:], i8[:], i8[:], f8[:], f8, f4[:])', cache=True, fastmath=True, nogil=True)
+def bin_bars(mag, starts, ends, scale, noise_floor, out):
+    """
+    Average magnitudes over contiguous bin ranges and apply noise floor.
+
+    Args:
+        mag: FFT magnitudes
+        starts: First magnitude index of each bin
+        ends: One past the last magnitude index of each bin
+        scale: Per-bin weight / bin width (0 for empty bins)
+        noise_floor: Value subtracted from every bar
+        out: Output bar buffer (written)
+    """
+    for b in range(out.shape[0]):
+        acc = 0.0
+        for k in range(starts[b], ends[b]):
+            acc += mag[k]
+        v = acc * scale[b] - noise_floor
+        out[b] = v if v > 0 else 0.0
+
@@ -0,0 +1,61 @@
+"""
+Frame pacing for FFT visualizer.
+
+Paces the render loop on absolute deadlines, waking early when new audio arrives.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from typing import Callable, Optional
+
+
+class FramePacer:
+    """
+    Waits until the next frame deadline in a single blocking call.
+
+    Deadlines advance by a fixed integer number of nanoseconds from a
+    monotonic start, so time spent scaling and drawing is subtracted from
+    the wait instead of added to it, and rounding never accumulates into
+    drift. A frame that overruns its deadline resets the schedule to now,
+    so a slow frame is not followed by a burst of unpaced catch-up frames.
+
+    When given a wake function (e.g. AnalysisWorker.wait_for_data), the
+    frame delay doubles as the wait for the next audio block: a block that
+    arrives mid-interval is rendered immediately instead of after a fixed
+    sleep. An early wake restarts the schedule from the wake time, so the
+    next deadline is never more than one interval ahead.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        wake: Optional[Callable[[float], bool]] = None
+    ):
+        """
+        Initialize frame pacer.
+
+        Args:
+            interval: Target delay between frames in seconds
+            wake: Optional blocking wait taking a timeout, returning True
+                  when woken early by new data
+        """
+        self.interval = interval
+        self.interval_ns = int(interval * 1e9)
+        self._wait = wake if wake is not None else time.sleep
+        self._deadline_ns = time.monotonic_ns()
+
+    def wait(self) -> None:
+        """Block until the next frame deadline."""
+        self._deadline_ns += self.interval_ns
+        now_ns = time.monotonic_ns()
+        remaining_ns = self._deadline_ns - now_ns
+        if remaining_ns > 0:
+            if self._wait(remaining_ns * 1e-9):
+                # Woken early: schedule from now, so early wakes never build
+                # up a lead of future deadlines
+                self._deadline_ns = time.monotonic_ns()
+        else:
+            # Behind schedule: drop the missed ticks instead of catching up
+            self._deadline_ns = now_ns
@@ -0,0 +1,109 @@
+"""
+Background FFT analysis for FFT visualizer.
+
+Runs the FFT once per audio block on a worker thread so the render loop
+only scales and draws.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import numpy as np  # type: ignore
+from typing import List, Optional, Tuple
+
+from core.audio import AudioProcessor
+
+
+class AnalysisWorker:
+    """
+    Producer thread between the audio callback and the render loop.
+
+    Waits for each captured audio block, computes single-layer and per-layer
+    bars once (per-layer bars only while include_layers is set), and
+    publishes them as an immutable tuple. The render loop
+    reads the latest tuple every frame; arrays are freshly computed per
+    block, so a published result is never overwritten while being drawn.
+    """
+
+    def __init__(self, audio: AudioProcessor, poll_timeout: float = 0.1):
+        """
+        Initialize analysis worker.
+
+        Args:
+            audio: Started audio processor to read blocks from
+            poll_timeout: Max wait per block before re-checking for shutdown
+        """
+        self.audio = audio
+        self.poll_timeout = poll_timeout
+        
+        # Extract per-layer bars too; cleared while layered rendering is off
+        self.include_layers = True
+
+        self._latest: Tuple[Optional[np.ndarray], Optional[List[np.ndarray]]] = (None, None)
+        self._published = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="fft-analysis", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker thread and wait for it to exit."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    @property
+    def native_id(self) -> Optional[int]:
+        """OS thread id of the worker (None until started)."""
+        return self._thread.native_id if self._thread is not None else None
+
+    def latest(self) -> Tuple[Optional[np.ndarray], Optional[List[np.ndarray]]]:
+        """
+        Get the most recently published bars.
+
+        Returns:
+            Tuple of (bars, layer_bars); both None until the first block
+        """
+        return self._latest
+
+    def wait_for_data(self, timeout: float) -> bool:
+        """
+        Block until the next result is published.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if a new result was published, False on timeout
+        """
+        ready = self._published.wait(timeout)
+        self._published.clear()
+        return ready
+
+    def _run(self) -> None:
+        """Worker loop: one FFT per audio block."""
+        audio = self.audio
+        while self._running:
+            if not audio.wait_for_data(self.poll_timeout):
+                continue
+            # Single reference assignment publishes both results atomically
+            self._latest = audio.get_all_magnitudes(self.include_layers)
+            self._published.set()
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
+        return False
@@ -11,6 +11,7 @@ import numpy as np  # type: ignore
 from typing import Optional
 
 from config.settings import ScalingSettings, SensitivitySettings, SmoothingSettings
+from core.kernels import NUMBA_AVAILABLE, scale_smooth_peak
 
 
 class ScalingProcessor:
@@ -63,32 +64,56 @@ class ScalingProcessor:
         # Peak indicator tracking
         self.peak_heights = np.zeros(num_bins, dtype=np.float32)
         self.peak_hold_counters = np.zeros(num_bins, dtype=np.int32)
+        
+        # Normalized output buffer (reused every frame by the compiled kernel)
+        self.normalized_bars = np.zeros(num_bins, dtype=np.float32)
     
     def process(
         self,
         bars: np.ndarray,
         peak_hold_frames: int = 8,
-        peak_fall_speed: float = 0.08
+        peak_fall_speed: float = 0.08,
+        gain: float = 1.0
     ) -> tuple:
         """
         Process raw bar values through scaling and smoothing.
         
         Args:
-            bars: Raw FFT magnitudes after noise floor
+            bars: Raw FFT magnitudes after noise floor (any float dtype;
+                  converted to float32)
             peak_hold_frames: Frames to hold peak before falling
             peak_fall_speed: How fast peaks fall
+            gain: Multiplier applied to bars before scaling (e.g. layer boost)
         
         Returns:
             Tuple of (normalized_bars, smoothed_bars, peak_heights)
         """
-        # Apply silence threshold fade
-        peak = np.max(bars)
+        # The compiled kernel takes float32 only; keep both paths on one dtype
+        bars = np.asarray(bars, dtype=np.float32)
+        
+        # Apply silence threshold fade (gain folds into the scale, no copy)
+        peak = float(np.max(bars)) * gain
+        fade = 1.0
         if self.sensitivity.silence_threshold > 0 and peak < self.sensitivity.silence_threshold:
-            bars = bars * (peak / self.sensitivity.silence_threshold)
+            fade = peak / self.sensitivity.silence_threshold
         
         # Get normalization scale
         max_val = self._calculate_scale(peak)
         
+        if NUMBA_AVAILABLE:
+            # Fused normalize + smooth + peak tracking in one compiled pass
+            scale_smooth_peak(
+                bars, gain * fade / max_val,
+                self.smoothing.rise, self.smoothing.fall,
+                peak_hold_frames, peak_fall_speed,
+                self.normalized_bars, self.smoothed_bars,
+                self.peak_heights, self.peak_hold_counters
+            )
+            return self.normalized_bars, self.smoothed_bars, self.peak_heights
+        
+        if gain * fade != 1.0:
+            bars = bars * (gain * fade)
+        
         # Normalize
         normalized = bars / max_val
         
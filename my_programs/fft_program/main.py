@@ -23,17 +23,19 @@ Runtime Controls:
 import sys
 import os
 import time
-import select
 import tty
 import termios
 import json
+import gc
+import queue
+import threading
 import numpy as np  # type: ignore
 
 # Ensure the fft_program package is importable
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import Settings, load_settings
-from core import MatrixApp, AudioProcessor, ScalingProcessor
+from config import Settings, PeakColorMode, load_settings
+from core import MatrixApp, AudioProcessor, AnalysisWorker, ScalingProcessor, FramePacer
 from themes import get_theme, list_themes
 from visualizers import get_visualizer, draw_peaks
 
@@ -41,6 +43,9 @@ from visualizers import get_visualizer, draw_peaks
 STATE_VERSION = 1
 RUNTIME_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runtime_state.json")
 
+# Registered theme names, resolved once at import
+_THEMES: tuple[str, ...] = tuple(list_themes())
+
 
 def _extract_dynamic_theme_state(theme) -> dict:
     """Extract dynamic-theme runtime parameters if supported by this theme."""
@@ -123,21 +128,52 @@ def should_reload_prior_state(prior_state: dict | None) -> bool:
 
 
 class KeyboardHandler:
-    """Non-blocking keyboard input handler for Unix/macOS."""
+    """
+    Keyboard input handler for Unix/macOS.
+    
+    A background thread blocks on the terminal and queues keypresses, so
+    polling from the render loop is a queue check instead of a syscall.
+    """
     
     def __init__(self):
         self.old_settings = None
+        self.fd = sys.stdin.fileno()
+        self._keys: queue.SimpleQueue = queue.SimpleQueue()
+        self._running = False
+        self._thread: threading.Thread | None = None
     
     def __enter__(self):
-        """Set terminal to raw mode for single keypress detection."""
-        self.old_settings = termios.tcgetattr(sys.stdin)
-        tty.setcbreak(sys.stdin.fileno())
+        """Set terminal to raw mode and start the reader thread."""
+        self.old_settings = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd)
+        # VMIN=0/VTIME=1: read() returns after at most 0.1s without a key,
+        # so the reader thread can notice shutdown (unlike O_NONBLOCK, this
+        # does not leak into stdout when both share the terminal)
+        attrs = termios.tcgetattr(self.fd)
+        attrs[6][termios.VMIN] = 0
+        attrs[6][termios.VTIME] = 1
+        termios.tcsetattr(self.fd, termios.TCSANOW, attrs)
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._read_keys, name="keyboard", daemon=True)
+        self._thread.start()
         return self
     
     def __exit__(self, *args):
-        """Restore terminal settings."""
+        """Stop the reader thread and restore terminal settings."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=0.5)
+            self._thread = None
         if self.old_settings:
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, self.old_settings)
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.old_settings)
+    
+    def _read_keys(self) -> None:
+        """Reader thread: queue each character typed."""
+        while self._running:
+            data = os.read(self.fd, 32)
+            for key in data.decode(errors='ignore'):
+                self._keys.put(key)
     
     def get_key(self) -> str | None:
         """
@@ -146,16 +182,17 @@ class KeyboardHandler:
         Returns:
             Single character if key pressed, None otherwise
         """
-        if select.select([sys.stdin], [], [], 0)[0]:
-            return sys.stdin.read(1)
-        return None
+        try:
+            return self._keys.get_nowait()
+        except queue.Empty:
+            return None
 
 
 class ThemeCycler:
     """Manages cycling through available themes."""
     
     def __init__(self, initial_theme: str, brightness_boost: float = 1.0):
-        self.themes = list_themes()
+        self.themes = _THEMES
         self.brightness_boost = brightness_boost
         try:
             self.current_index = self.themes.index(initial_theme)
@@ -181,6 +218,88 @@ class ThemeCycler:
         return get_theme(self.current_theme_name, brightness_boost=self.brightness_boost)
 
 
+def preload_themes(width: int, height: int, brightness_boost: float = 1.0) -> None:
+    """
+    Build every static theme and its color tables ahead of the first frame.
+    
+    Theme instances and tables are cached (see get_theme / build_lut), so
+    the first t/T press on each theme no longer stalls the render loop.
+    """
+    for name in _THEMES:
+        get_theme(name, brightness_boost=brightness_boost).build_lut(width, height)
+
+
+def reserve_realtime_priority(priority: int = 10) -> bool:
+    """
+    Let the render thread switch to SCHED_FIFO after root is dropped.
+    
+    rgbmatrix drops root privileges when the matrix is initialized, but
+    the render thread can only be made real-time once the worker threads
+    are running. Raising RLIMIT_RTPRIO while still root lets the
+    unprivileged process pick SCHED_FIFO up to that priority later.
+    Nothing is rescheduled here, so threads started in between inherit
+    the normal scheduler and the full CPU mask.
+    
+    Args:
+        priority: Highest SCHED_FIFO priority to allow
+    
+    Returns:
+        True if the limit was raised
+    """
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_RTPRIO)
+        if hard != resource.RLIM_INFINITY:
+            hard = max(hard, priority)
+        if soft != resource.RLIM_INFINITY:
+            soft = max(soft, priority)
+        resource.setrlimit(resource.RLIMIT_RTPRIO, (soft, hard))
+    except (ImportError, AttributeError, ValueError, OSError) as e:
+        print(f"Warning: could not raise real-time priority limit: {e}")
+        return False
+    return True
+
+
+def enable_realtime_scheduling(
+    cpu: int | None = None,
+    priority: int = 10,
+    other_threads: tuple = ()
+) -> bool:
+    """
+    Pin the calling (render) thread to one CPU core and switch it to SCHED_FIFO.
+    
+    Linux affinity and scheduling policy are per thread, so only the
+    calling thread changes; call it from the render loop once the worker
+    threads have started. The threads in other_threads (native ids) are
+    moved off the render core so the FFT producer keeps running in
+    parallel with drawing. Audio (PortAudio) and keyboard threads keep the
+    normal scheduler and their default CPU mask. The default core is the
+    one before the last, which the matrix refresh thread claims.
+    
+    Args:
+        cpu: Core to pin to (None = second-to-last core)
+        priority: SCHED_FIFO priority (kept below the matrix refresh thread)
+        other_threads: Native thread ids to keep off the render core
+    
+    Returns:
+        True if both affinity and scheduler were applied
+    """
+    if cpu is None:
+        cpu = max(0, (os.cpu_count() or 1) - 2)
+    try:
+        other_cpus = os.sched_getaffinity(0) - {cpu}
+        os.sched_setaffinity(0, {cpu})
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        if other_cpus:
+            for tid in other_threads:
+                os.sched_setaffinity(tid, other_cpus)
+    except (AttributeError, PermissionError, OSError) as e:
+        print(f"Warning: real-time scheduling unavailable: {e}")
+        return False
+    print(f"Real-time scheduling: render thread on CPU {cpu}, SCHED_FIFO priority {priority}")
+    return True
+
+
 def print_startup_info(width: int, height: int, theme: str, visualizer: str, shadow: bool, peak: bool, gradient: bool, overflow: bool):
     """Print startup information and controls."""
     print(f"\n{'='*50}")
@@ -190,12 +309,10 @@ def print_startup_info(width: int, height: int, theme: str, visualizer: str, sha
     print(f"\nCurrent: theme={theme}, shadow={'ON' if shadow else 'OFF'}, peak={'ON' if peak else 'OFF'}")
     print(f"         gradient={'ON' if gradient else 'OFF'}, overflow={'ON' if overflow else 'OFF'}")
     
-    print(f"\n[t/T] Themes ({len(list_themes())} available):")
-    themes = list_themes()
+    themes = _THEMES
+    print(f"\n[t/T] Themes ({len(themes)} available):")
     # Print themes in rows of 4
-    for i in range(0, len(themes), 4):
-        row = themes[i:i+4]
-        print(f"    {', '.join(row)}")
+    print('\n'.join('    ' + ', '.join(themes[i:i+4]) for i in range(0, len(themes), 4)))
     
     print(f"\nMain Controls:")
     print(f"[g] Toggle gradient mode (per-pixel vs uniform color)")
@@ -230,7 +347,7 @@ def main():
     # Add custom arguments
     app.add_argument(
         "--theme",
-        help=f"Color theme. Available: {', '.join(list_themes())}",
+        help=f"Color theme. Available: {', '.join(_THEMES)}",
         default=None,
         type=str
     )
@@ -249,6 +366,17 @@ def main():
         action="store_true",
         help="Start with overflow mode enabled (bars can exceed height)"
     )
+    app.add_argument(
+        "--rt",
+        action="store_true",
+        help="Pin the render thread to a dedicated CPU core with SCHED_FIFO priority (requires root)"
+    )
+    app.add_argument(
+        "--rt-cpu",
+        help="CPU core used with --rt (default: second-to-last core)",
+        default=None,
+        type=int
+    )
     
     # Parse arguments
     args = app.process_args()
@@ -256,12 +384,12 @@ def main():
     # Handle list commands
     if args.list_themes:
         print("Available themes:")
-        for theme_name in list_themes():
+        for theme_name in _THEMES:
             print(f"  - {theme_name}")
         sys.exit(0)
     
     # Load settings from file or use defaults
-    settings_path = getattr(args, 'settings', None)
+    settings_path = args.settings
     settings = load_settings(settings_path)
     
     # Override settings from command line if provided
@@ -269,7 +397,7 @@ def main():
         settings.color.theme = args.theme
     
     # Override mode settings from command line
-    gradient_enabled = getattr(args, 'gradient', False)
+    gradient_enabled = args.gradient
     if args.overflow:
         settings.overflow.enabled = True
 
@@ -285,7 +413,9 @@ def main():
         if 'peak_enabled' in persisted_settings:
             settings.peak.enabled = bool(persisted_settings['peak_enabled'])
         if 'peak_color_mode' in persisted_settings:
-            settings.peak.color_mode = persisted_settings['peak_color_mode']
+            settings.peak.color_mode = PeakColorMode.parse(
+                persisted_settings['peak_color_mode'], default=settings.peak.color_mode
+            )
 
         zoom_idx = persisted_settings.get('zoom_preset_index')
         if isinstance(zoom_idx, int) and settings.frequency.zoom_presets:
@@ -301,6 +431,10 @@ def main():
     # Always use the unified visualizer
     visualizer_name = "bars"
     
+    # The real-time priority limit must be raised while we still have root
+    if args.rt:
+        reserve_realtime_priority()
+    
     # Initialize matrix
     if not app.initialize_matrix():
         app.print_help()
@@ -323,6 +457,9 @@ def main():
             num_bins=app.width
         )
         
+        # Background FFT worker (started with the main loop)
+        analysis = AnalysisWorker(audio)
+        
         # Scaling processor
         scaler = ScalingProcessor(
             scaling_settings=settings.scaling,
@@ -343,6 +480,10 @@ def main():
         # Apply command line mode overrides
         if gradient_enabled:
             visualizer.gradient_mode = True
+
+        # Optional visualizer test modes, resolved once instead of per keypress
+        toggle_full = getattr(visualizer, 'toggle_full', None)
+        toggle_debug = getattr(visualizer, 'toggle_debug', None)
         
         # Theme
         theme = get_theme(
@@ -358,10 +499,17 @@ def main():
         )
         
         layer_scalers = []
+        
+        # Preallocated per-layer outputs: one contiguous float32 block with a
+        # row view per layer, plus the per-frame lists handed to draw()
+        layer_rows = []
+        smoothed_layers_buf = []
+        layer_peaks_buf = []
+        layer_gains = []
 
         def ensure_layer_pipeline() -> None:
             """Ensure audio/layer visualizer/scalers are initialized for layered mode."""
-            nonlocal layer_scalers
+            nonlocal layer_scalers, layer_rows, smoothed_layers_buf, layer_peaks_buf, layer_gains
 
             if not audio.layers_enabled:
                 audio.setup_layers(settings.layers.layers)
@@ -383,6 +531,15 @@ def main():
                         frame_rate=1.0 / settings.audio.sleep_delay
                     )
                     layer_scalers.append(layer_scaler)
+                
+                max_bins = max(lc.bins for lc in settings.layers.layers)
+                layer_block = np.zeros((len(layer_scalers), max_bins), dtype=np.float32)
+                layer_rows = [
+                    layer_block[i, :lc.bins] for i, lc in enumerate(settings.layers.layers)
+                ]
+                smoothed_layers_buf = [None] * len(layer_scalers)
+                layer_peaks_buf = [None] * len(layer_scalers)
+                layer_gains = [lc.boost for lc in settings.layers.layers]
 
         if settings.layers.enabled:
             ensure_layer_pipeline()
@@ -393,7 +550,9 @@ def main():
             persisted_visualizer = state.get('visualizer', {})
 
             if 'peak_color_mode' in persisted_settings:
-                settings.peak.color_mode = persisted_settings['peak_color_mode']
+                settings.peak.color_mode = PeakColorMode.parse(
+                    persisted_settings['peak_color_mode'], default=settings.peak.color_mode
+                )
 
             # Global/single-mode visualizer flags
             for attr in ('gradient_mode', 'overflow_mode', 'bars_enabled', 'full_mode', 'debug_mode'):
@@ -477,7 +636,7 @@ def main():
                 'settings': {
                     'shadow_enabled': settings.shadow.enabled,
                     'peak_enabled': settings.peak.enabled,
-                    'peak_color_mode': settings.peak.color_mode,
+                    'peak_color_mode': settings.peak.color_mode.name.lower(),
                     'zoom_preset_index': settings.frequency.zoom_preset_index,
                 },
                 'visualizer': {
@@ -503,318 +662,384 @@ def main():
         print(f"Initialization error: {e}")
         sys.exit(1)
     
+    # Per-frame settings bound to locals; key handlers below refresh them
+    sleep_delay = settings.audio.sleep_delay
+    peak_hold_frames = settings.peak.hold_frames
+    peak_fall_speed = settings.peak.fall_speed
+    peak_enabled = settings.peak.enabled
+
+    # Keyboard handlers: built once, dispatched by key in the main loop
+    def get_active_theme_instance():
+        if visualizer.layers_enabled and visualizer.layer_states:
+            return visualizer.layer_states[visualizer.active_layer].theme
+        return visualizer.theme
+
+    def get_active_layer_prefix() -> str:
+        if visualizer.layers_enabled and visualizer.layer_states:
+            return f"Layer {visualizer.active_layer + 1} "
+        return ""
+
+    def apply_cycled_theme(new_theme) -> None:
+        """Apply a theme from the cycler (to the active layer if layered mode)."""
+        if visualizer.layers_enabled:
+            visualizer.set_layer_theme(
+                theme_cycler.current_theme_name,
+                brightness_boost=settings.color.brightness_boost
+            )
+            info = visualizer.get_active_layer_info()
+            print(f"Layer {info['index']+1} theme: {theme_cycler.current_theme_name}")
+        else:
+            visualizer.set_theme(new_theme)
+            print(f"Theme: {theme_cycler.current_theme_name}")
+
+    def on_next_theme() -> None:
+        apply_cycled_theme(theme_cycler.next_theme())
+
+    def on_prev_theme() -> None:
+        apply_cycled_theme(theme_cycler.prev_theme())
+
+    def on_toggle_gradient() -> None:
+        # Toggle gradient mode (for active layer if layered mode)
+        gradient_on = visualizer.toggle_gradient()
+        if visualizer.layers_enabled:
+            info = visualizer.get_active_layer_info()
+            print(f"Layer {info['index']+1} gradient: {'ON' if gradient_on else 'OFF'}")
+        else:
+            print(f"Gradient: {'ON (per-pixel)' if gradient_on else 'OFF (uniform)'}")
+
+    def on_toggle_overflow() -> None:
+        # Toggle overflow mode (for active layer if layered mode)
+        overflow_on = visualizer.toggle_overflow()
+        if visualizer.layers_enabled:
+            info = visualizer.get_active_layer_info()
+            print(f"Layer {info['index']+1} overflow: {'ON' if overflow_on else 'OFF'}")
+        else:
+            print(f"Overflow: {'ON' if overflow_on else 'OFF'}")
+
+    def on_next_zoom() -> None:
+        preset = settings.frequency.next_zoom_preset()
+        audio.update_frequency_range()
+        print(f"Zoom preset: {preset[0]} - {preset[1]} Hz")
+
+    def on_prev_zoom() -> None:
+        preset = settings.frequency.prev_zoom_preset()
+        audio.update_frequency_range()
+        print(f"Zoom preset: {preset[0]} - {preset[1]} Hz")
+
+    def on_toggle_bars() -> None:
+        # Toggle bars for active layer (to see peaks only)
+        bars_on = visualizer.toggle_bars()
+        if visualizer.layers_enabled:
+            info = visualizer.get_active_layer_info()
+            print(f"Layer {info['index']+1} bars: {'ON' if bars_on else 'OFF'}")
+        else:
+            print(f"Bars: {'ON' if bars_on else 'OFF (peaks only)'}")
+
+    def on_toggle_full() -> None:
+        # Toggle full mode (if visualizer supports it)
+        if toggle_full is not None:
+            full_on = toggle_full()
+            print(f"Full: {'ON (gradient scaled by FFT)' if full_on else 'OFF'}")
+
+    def on_toggle_debug() -> None:
+        # Toggle debug mode (if visualizer supports it)
+        if toggle_debug is not None:
+            debug_on = toggle_debug()
+            print(f"Debug: {'ON (static gradient)' if debug_on else 'OFF'}")
+
+    def on_toggle_layers() -> None:
+        nonlocal render_frame
+        if hasattr(visualizer, 'toggle_layers'):
+            layers_on = visualizer.toggle_layers()
+            settings.layers.enabled = layers_on
+            print(f"Layered mode: {'ON' if layers_on else 'OFF'}")
+            
+            # Setup layers if not already done
+            if layers_on:
+                ensure_layer_pipeline()
+            render_frame = frame_layered if layers_on else frame_single
+            # Only bin per-layer bars while they are drawn
+            analysis.include_layers = layers_on
+            
+            if layers_on:
+                info = visualizer.get_active_layer_info()
+                print(f"  Editing layer {info['index']+1}: {info['theme']}")
+
+    def make_select_layer(index: int):
+        """Build the handler that selects layer `index` for editing."""
+        def on_select_layer() -> None:
+            if visualizer.layers_enabled:
+                if visualizer.select_layer(index):
+                    info = visualizer.get_active_layer_info()
+                    print(f"Editing layer {index+1}: {info['theme']} (g={info['gradient']}, o={info['overflow']})")
+                else:
+                    print(f"Layer {index+1} not available")
+        return on_select_layer
+
+    def make_toggle_layer(index: int):
+        """Build the handler that toggles visibility of layer `index`."""
+        def on_toggle_layer() -> None:
+            if visualizer.layers_enabled:
+                if index < len(visualizer.layer_states):
+                    visible = visualizer.toggle_layer_visibility(index)
+                    print(f"Layer {index+1} visibility: {'ON' if visible else 'OFF'}")
+                else:
+                    print(f"Layer {index+1} not available")
+        return on_toggle_layer
+
+    def on_move_layer_back() -> None:
+        # Move active layer toward background (drawn earlier)
+        if visualizer.layers_enabled:
+            result = visualizer.swap_draw_order(-1)
+            if result:
+                old_pos, new_pos = result
+                info = visualizer.get_active_layer_info()
+                print(f"Layer '{info['theme']}' moved to z-position {new_pos} (toward background)")
+            else:
+                print("Layer already at background")
+
+    def on_move_layer_forward() -> None:
+        # Move active layer toward foreground (drawn later)
+        if visualizer.layers_enabled:
+            result = visualizer.swap_draw_order(+1)
+            if result:
+                old_pos, new_pos = result
+                info = visualizer.get_active_layer_info()
+                print(f"Layer '{info['theme']}' moved to z-position {new_pos} (toward foreground)")
+            else:
+                print("Layer already at foreground")
+
+    def on_toggle_shadow() -> None:
+        settings.shadow.enabled = not settings.shadow.enabled
+        # Start from clean trails; buffers are reused, not reallocated
+        if settings.shadow.enabled:
+            visualizer.reset_shadow()
+        print(f"Shadow: {'ON' if settings.shadow.enabled else 'OFF'}")
+
+    def on_toggle_peak() -> None:
+        # Toggle peak mode (for active layer if layered mode)
+        nonlocal peak_enabled
+        if visualizer.layers_enabled:
+            peak_on = visualizer.toggle_peak()
+            info = visualizer.get_active_layer_info()
+            print(f"Layer {info['index']+1} peak: {'ON' if peak_on else 'OFF'}")
+        else:
+            # Write through to settings, but the loop reads the local
+            peak_enabled = settings.peak.enabled = not peak_enabled
+            print(f"Peak: {'ON' if peak_enabled else 'OFF'}")
+
+    peak_mode_descriptions = {
+        PeakColorMode.WHITE: 'white (always white)',
+        PeakColorMode.BAR: 'bar (matches bar color)',
+        PeakColorMode.CONTRAST: 'contrast (inverted bar color)',
+        PeakColorMode.PEAK: 'peak (color at max height)'
+    }
+
+    def on_cycle_peak_color() -> None:
+        settings.peak.color_mode = PeakColorMode((settings.peak.color_mode + 1) % len(PeakColorMode))
+        print(f"Peak color: {peak_mode_descriptions[settings.peak.color_mode]}")
+
+    def adjust_dynamic_speed(delta: float) -> None:
+        active_theme = get_active_theme_instance()
+        if hasattr(active_theme, 'adjust_cycle_speed'):
+            new_speed = active_theme.adjust_cycle_speed(delta)
+            print(f"{get_active_layer_prefix()}dynamic speed: {new_speed:.3f} cycles/sec")
+        else:
+            print(f"{get_active_layer_prefix()}theme is not dynamic")
+
+    def on_dynamic_slower() -> None:
+        adjust_dynamic_speed(-0.01)
+
+    def on_dynamic_faster() -> None:
+        adjust_dynamic_speed(0.01)
+
+    def on_dynamic_reseed() -> None:
+        active_theme = get_active_theme_instance()
+        if hasattr(active_theme, 'reseed_start_hue'):
+            new_hue = active_theme.reseed_start_hue()
+            print(f"{get_active_layer_prefix()}dynamic reseed: start_hue={new_hue:.3f}")
+        else:
+            print(f"{get_active_layer_prefix()}theme is not dynamic")
+
+    def on_dynamic_freeze() -> None:
+        active_theme = get_active_theme_instance()
+        if hasattr(active_theme, 'toggle_frozen'):
+            is_frozen = active_theme.toggle_frozen()
+            print(f"{get_active_layer_prefix()}dynamic: {'FROZEN' if is_frozen else 'RUNNING'}")
+        else:
+            print(f"{get_active_layer_prefix()}theme is not dynamic")
+
+    key_handlers = {
+        't': on_next_theme,
+        'T': on_prev_theme,
+        'g': on_toggle_gradient,
+        'o': on_toggle_overflow,
+        'r': on_next_zoom,
+        'R': on_prev_zoom,
+        'b': on_toggle_bars,
+        'f': on_toggle_full,
+        'd': on_toggle_debug,
+        'l': on_toggle_layers,
+        '1': make_select_layer(0),
+        '2': make_select_layer(1),
+        '3': make_select_layer(2),
+        '!': make_toggle_layer(0),
+        '@': make_toggle_layer(1),
+        '#': make_toggle_layer(2),
+        '<': on_move_layer_back,
+        '>': on_move_layer_forward,
+        's': on_toggle_shadow,
+        'p': on_toggle_peak,
+        'P': on_cycle_peak_color,
+        '[': on_dynamic_slower,
+        ']': on_dynamic_faster,
+        'c': on_dynamic_reseed,
+        'x': on_dynamic_freeze,
+    }
+    
+    # Per-mode frame renderers: the 'l' handler swaps render_frame between
+    # them, so the loop never re-tests which mode it is in
+    def frame_single(bars, layer_bars_raw) -> None:
+        """Scale and draw one single-layer frame, with the peak overlay."""
+        _, smoothed, peaks = scaler.process(
+            bars,
+            peak_hold_frames=peak_hold_frames,
+            peak_fall_speed=peak_fall_speed
+        )
+        visualizer.draw(app.canvas, smoothed, None)
+        
+        # Draw peaks as independent overlay (only for non-layered mode)
+        if peak_enabled:
+            draw_peaks(
+                app.canvas,
+                peaks,
+                peak_theme,
+                settings,
+                app.height
+            )
+
+    def frame_layered(bars, layer_bars_raw) -> None:
+        """Scale every visible layer and draw one layered frame."""
+        # Single-layer scaler keeps running as the fallback bar source
+        _, smoothed, _ = scaler.process(
+            bars,
+            peak_hold_frames=peak_hold_frames,
+            peak_fall_speed=peak_fall_speed
+        )
+        if layer_bars_raw is None or not layer_scalers:
+            visualizer.draw(app.canvas, smoothed, None)
+            return
+        
+        # Process each layer through its own scaler (skip invisible layers)
+        smoothed_layers = smoothed_layers_buf
+        layer_peaks = layer_peaks_buf
+        for i, (raw_bars, layer_scaler) in enumerate(zip(layer_bars_raw, layer_scalers)):
+            # Skip processing if layer is not visible
+            if i < len(visualizer.layer_states) and not visualizer.layer_states[i].visible:
+                # None placeholders maintain index alignment
+                smoothed_layers[i] = None
+                layer_peaks[i] = None
+                continue
+            
+            # Process through layer's scaler with boost from layer
+            # config applied as gain (also tracks peaks)
+            _, layer_smoothed, layer_peak = layer_scaler.process(
+                raw_bars,
+                peak_hold_frames=peak_hold_frames,
+                peak_fall_speed=peak_fall_speed,
+                gain=layer_gains[i]
+            )
+            row = layer_rows[i]
+            np.clip(layer_smoothed, 0, 1, out=row)
+            smoothed_layers[i] = row
+            layer_peaks[i] = layer_peak
+        
+        visualizer.draw(
+            app.canvas,
+            smoothed,
+            None,
+            layer_bars=smoothed_layers,
+            layer_peaks=layer_peaks
+        )
+
+    render_frame = frame_layered if visualizer.layers_enabled else frame_single
+    analysis.include_layers = visualizer.layers_enabled
+    
     # Main loop
     try:
-        with audio, KeyboardHandler() as keyboard:
-            time.sleep(0.5)  # Let audio stream settle
+        with audio, analysis, KeyboardHandler() as keyboard:
+            # Let audio stream settle; theme tables are built meanwhile
+            settle_until = time.monotonic() + 0.5
+            preload_themes(app.width, app.height, settings.color.brightness_boost)
+            time.sleep(max(0.0, settle_until - time.monotonic()))
             last_state_save_time = 0.0
             state_save_interval = 2.0
             
+            # Workers are running: make only this (render) thread real-time
+            if args.rt:
+                enable_realtime_scheduling(
+                    args.rt_cpu,
+                    other_threads=tuple(tid for tid in (analysis.native_id,) if tid is not None)
+                )
+
+            # Cyclic GC only runs at state-save checkpoints (every keypress
+            # and every state_save_interval), never in the middle of a frame.
+            # The startup heap (modules, themes, color tables) gets the only
+            # full collection and is then frozen out of collection; the
+            # checkpoints only collect young objects: generation 0 on a
+            # keypress, generations 0-1 at the timed save.
+            gc.collect()
+            gc.freeze()
+            gc.disable()
+
+            # Frame delay doubles as the wait for the next analysed block
+            pacer = FramePacer(sleep_delay, wake=analysis.wait_for_data)
+            
+            # Bind per-frame callables as locals (LOAD_FAST in the loop)
+            _pace = pacer.wait
+            _now = time.monotonic
+            
+            # Theme for the peak overlay; only a keypress can change it
+            peak_theme = visualizer.theme
+            
             while True:
                 # Check for keyboard input
                 key = keyboard.get_key()
                 state_dirty = key is not None
-
-                def get_active_theme_instance():
-                    if visualizer.layers_enabled and visualizer.layer_states:
-                        return visualizer.layer_states[visualizer.active_layer].theme
-                    return visualizer.theme
-
-                def get_active_layer_prefix() -> str:
-                    if visualizer.layers_enabled and visualizer.layer_states:
-                        return f"Layer {visualizer.active_layer + 1} "
-                    return ""
-
-                if key == 't':
-                    # Next theme (for active layer if layered mode)
-                    new_theme = theme_cycler.next_theme()
-                    if visualizer.layers_enabled:
-                        visualizer.set_layer_theme(
-                            theme_cycler.current_theme_name,
-                            brightness_boost=settings.color.brightness_boost
-                        )
-                        info = visualizer.get_active_layer_info()
-                        print(f"Layer {info['index']+1} theme: {theme_cycler.current_theme_name}")
-                    else:
-                        visualizer.set_theme(new_theme)
-                        print(f"Theme: {theme_cycler.current_theme_name}")
-                elif key == 'T':
-                    # Previous theme (for active layer if layered mode)
-                    new_theme = theme_cycler.prev_theme()
-                    if visualizer.layers_enabled:
-                        visualizer.set_layer_theme(
-                            theme_cycler.current_theme_name,
-                            brightness_boost=settings.color.brightness_boost
-                        )
-                        info = visualizer.get_active_layer_info()
-                        print(f"Layer {info['index']+1} theme: {theme_cycler.current_theme_name}")
-                    else:
-                        visualizer.set_theme(new_theme)
-                        print(f"Theme: {theme_cycler.current_theme_name}")
-                elif key == 'g':
-                    # Toggle gradient mode (for active layer if layered mode)
-                    gradient_on = visualizer.toggle_gradient()
-                    if visualizer.layers_enabled:
-                        info = visualizer.get_active_layer_info()
-                        print(f"Layer {info['index']+1} gradient: {'ON' if gradient_on else 'OFF'}")
-                    else:
-                        print(f"Gradient: {'ON (per-pixel)' if gradient_on else 'OFF (uniform)'}")
-                elif key == 'o':
-                    # Toggle overflow mode (for active layer if layered mode)
-                    overflow_on = visualizer.toggle_overflow()
-                    if visualizer.layers_enabled:
-                        info = visualizer.get_active_layer_info()
-                        print(f"Layer {info['index']+1} overflow: {'ON' if overflow_on else 'OFF'}")
-                    else:
-                        print(f"Overflow: {'ON' if overflow_on else 'OFF'}")
-                elif key == 'r':
-                    # Next zoom preset
-                    preset = settings.frequency.next_zoom_preset()
-                    audio.update_frequency_range()
-                    print(f"Zoom preset: {preset[0]} - {preset[1]} Hz")
-                elif key == 'R':
-                    # Previous zoom preset
-                    preset = settings.frequency.prev_zoom_preset()
-                    audio.update_frequency_range()
-                    print(f"Zoom preset: {preset[0]} - {preset[1]} Hz")
-                elif key == 'b':
-                    # Toggle bars for active layer (to see peaks only)
-                    bars_on = visualizer.toggle_bars()
-                    if visualizer.layers_enabled:
-                        info = visualizer.get_active_layer_info()
-                        print(f"Layer {info['index']+1} bars: {'ON' if bars_on else 'OFF'}")
-                    else:
-                        print(f"Bars: {'ON' if bars_on else 'OFF (peaks only)'}")
-                elif key == 'f':
-                    # Toggle full mode (if visualizer supports it)
-                    if hasattr(visualizer, 'toggle_full'):
-                        full_on = visualizer.toggle_full()
-                        print(f"Full: {'ON (gradient scaled by FFT)' if full_on else 'OFF'}")
-                elif key == 'd':
-                    # Toggle debug mode (if visualizer supports it)
-                    if hasattr(visualizer, 'toggle_debug'):
-                        debug_on = visualizer.toggle_debug()
-                        print(f"Debug: {'ON (static gradient)' if debug_on else 'OFF'}")
-                elif key == 'l':
-                    # Toggle layered mode
-                    if hasattr(visualizer, 'toggle_layers'):
-                        layers_on = visualizer.toggle_layers()
-                        settings.layers.enabled = layers_on
-                        print(f"Layered mode: {'ON' if layers_on else 'OFF'}")
-                        
-                        # Setup layers if not already done
-                        if layers_on:
-                            ensure_layer_pipeline()
-                        
-                        if layers_on:
-                            info = visualizer.get_active_layer_info()
-                            print(f"  Editing layer {info['index']+1}: {info['theme']}")
-                elif key == '1':
-                    # Select layer 1 (index 0)
-                    if visualizer.layers_enabled:
-                        visualizer.select_layer(0)
-                        info = visualizer.get_active_layer_info()
-                        print(f"Editing layer 1: {info['theme']} (g={info['gradient']}, o={info['overflow']})")
-                elif key == '2':
-                    # Select layer 2 (index 1)
-                    if visualizer.layers_enabled:
-                        visualizer.select_layer(1)
-                        info = visualizer.get_active_layer_info()
-                        print(f"Editing layer 2: {info['theme']} (g={info['gradient']}, o={info['overflow']})")
-                elif key == '!':
-                    # Toggle layer 1 visibility (Shift+1)
-                    if visualizer.layers_enabled:
-                        visible = visualizer.toggle_layer_visibility(0)
-                        print(f"Layer 1 visibility: {'ON' if visible else 'OFF'}")
-                elif key == '@':
-                    # Toggle layer 2 visibility (Shift+2)
-                    if visualizer.layers_enabled:
-                        visible = visualizer.toggle_layer_visibility(1)
-                        print(f"Layer 2 visibility: {'ON' if visible else 'OFF'}")
-                elif key == '3':
-                    # Select layer 3 (index 2)
-                    if visualizer.layers_enabled:
-                        if visualizer.select_layer(2):
-                            info = visualizer.get_active_layer_info()
-                            print(f"Editing layer 3: {info['theme']} (g={info['gradient']}, o={info['overflow']})")
-                        else:
-                            print("Layer 3 not available")
-                elif key == '#':
-                    # Toggle layer 3 visibility (Shift+3)
-                    if visualizer.layers_enabled:
-                        visible = visualizer.toggle_layer_visibility(2)
-                        if visible is not False:
-                            print(f"Layer 3 visibility: {'ON' if visible else 'OFF'}")
-                        else:
-                            print("Layer 3 not available")
-                elif key == '<':
-                    # Move active layer toward background (drawn earlier)
-                    if visualizer.layers_enabled:
-                        result = visualizer.swap_draw_order(-1)
-                        if result:
-                            old_pos, new_pos = result
-                            info = visualizer.get_active_layer_info()
-                            print(f"Layer '{info['theme']}' moved to z-position {new_pos} (toward background)")
-                        else:
-                            print("Layer already at background")
-                elif key == '>':
-                    # Move active layer toward foreground (drawn later)
-                    if visualizer.layers_enabled:
-                        result = visualizer.swap_draw_order(+1)
-                        if result:
-                            old_pos, new_pos = result
-                            info = visualizer.get_active_layer_info()
-                            print(f"Layer '{info['theme']}' moved to z-position {new_pos} (toward foreground)")
-                        else:
-                            print("Layer already at foreground")
-                elif key == 's':
-                    # Toggle shadow mode
-                    settings.shadow.enabled = not settings.shadow.enabled
-                    # Re-initialize shadow buffers in visualizer
-                    if settings.shadow.enabled:
-                        visualizer.shadow_buffer = np.zeros((app.width, app.height), dtype=np.float32)
-                        visualizer.shadow_colors = np.zeros((app.width, app.height, 3), dtype=np.uint8)
-                    else:
-                        visualizer.shadow_buffer = None
-                        visualizer.shadow_colors = None
-                    print(f"Shadow: {'ON' if settings.shadow.enabled else 'OFF'}")
-                elif key == 'p':
-                    # Toggle peak mode (for active layer if layered mode)
-                    if visualizer.layers_enabled:
-                        peak_on = visualizer.toggle_peak()
-                        info = visualizer.get_active_layer_info()
-                        print(f"Layer {info['index']+1} peak: {'ON' if peak_on else 'OFF'}")
-                    else:
-                        settings.peak.enabled = not settings.peak.enabled
-                        print(f"Peak: {'ON' if settings.peak.enabled else 'OFF'}")
-                elif key == 'P':
-                    # Cycle peak color mode
-                    peak_modes = ['white', 'bar', 'contrast', 'peak']
-                    current_idx = peak_modes.index(settings.peak.color_mode)
-                    new_idx = (current_idx + 1) % len(peak_modes)
-                    settings.peak.color_mode = peak_modes[new_idx]
-                    mode_descriptions = {
-                        'white': 'white (always white)',
-                        'bar': 'bar (matches bar color)',
-                        'contrast': 'contrast (inverted bar color)',
-                        'peak': 'peak (color at max height)'
-                    }
-                    print(f"Peak color: {mode_descriptions[settings.peak.color_mode]}")
-                elif key == '[':
-                    active_theme = get_active_theme_instance()
-                    if hasattr(active_theme, 'adjust_cycle_speed'):
-                        new_speed = active_theme.adjust_cycle_speed(-0.01)
-                        print(f"{get_active_layer_prefix()}dynamic speed: {new_speed:.3f} cycles/sec")
-                    else:
-                        print(f"{get_active_layer_prefix()}theme is not dynamic")
-                elif key == ']':
-                    active_theme = get_active_theme_instance()
-                    if hasattr(active_theme, 'adjust_cycle_speed'):
-                        new_speed = active_theme.adjust_cycle_speed(0.01)
-                        print(f"{get_active_layer_prefix()}dynamic speed: {new_speed:.3f} cycles/sec")
-                    else:
-                        print(f"{get_active_layer_prefix()}theme is not dynamic")
-                elif key == 'c':
-                    active_theme = get_active_theme_instance()
-                    if hasattr(active_theme, 'reseed_start_hue'):
-                        new_hue = active_theme.reseed_start_hue()
-                        print(f"{get_active_layer_prefix()}dynamic reseed: start_hue={new_hue:.3f}")
-                    else:
-                        print(f"{get_active_layer_prefix()}theme is not dynamic")
-                elif key == 'x':
-                    active_theme = get_active_theme_instance()
-                    if hasattr(active_theme, 'toggle_frozen'):
-                        is_frozen = active_theme.toggle_frozen()
-                        print(f"{get_active_layer_prefix()}dynamic: {'FROZEN' if is_frozen else 'RUNNING'}")
-                    else:
-                        print(f"{get_active_layer_prefix()}theme is not dynamic")
-                
-                # Get FFT data
-                bars = audio.get_fft_magnitudes()
-                layer_bars_raw = None
+                if state_dirty:
+                    handler = key_handlers.get(key)
+                    if handler is not None:
+                        handler()
+                        peak_theme = visualizer.theme
                 
-                # Get layer data if enabled
-                if audio.layers_enabled and visualizer.layers_enabled:
-                    layer_bars_raw = audio.get_layer_magnitudes()
+                # Get FFT data (computed once per audio block by the worker;
+                # layer bars are published alongside, never on their own)
+                bars, layer_bars_raw = analysis.latest()
                 
-                if bars is None and layer_bars_raw is None:
-                    now = time.time()
+                if bars is None:
+                    now = _now()
                     if state_dirty or (now - last_state_save_time) >= state_save_interval:
                         save_runtime_state(build_runtime_state())
                         last_state_save_time = now
-                    time.sleep(0.001)
+                        gc.collect(0 if state_dirty else 1)
+                    analysis.wait_for_data(sleep_delay)
                     continue
                 
-                # Process through scaler (for single-layer mode or fallback)
-                normalized, smoothed, peaks = scaler.process(
-                    bars if bars is not None else np.zeros(app.width),
-                    peak_hold_frames=settings.peak.hold_frames,
-                    peak_fall_speed=settings.peak.fall_speed
-                )
-                
-                # Process each layer through its own scaler (skip invisible layers)
-                smoothed_layers = None
-                layer_peaks = None
-                if layer_bars_raw is not None and layer_scalers and visualizer.layers_enabled:
-                    smoothed_layers = []
-                    layer_peaks = []
-                    for i, (raw_bars, layer_scaler) in enumerate(zip(layer_bars_raw, layer_scalers)):
-                        # Skip processing if layer is not visible
-                        if i < len(visualizer.layer_states) and not visualizer.layer_states[i].visible:
-                            # Append None placeholders to maintain index alignment
-                            smoothed_layers.append(None)
-                            layer_peaks.append(None)
-                            continue
-                        
-                        # Apply boost from layer config
-                        boost = settings.layers.layers[i].boost
-                        boosted = raw_bars * boost
-                        
-                        # Process through layer's scaler (also tracks peaks)
-                        _, layer_smoothed, layer_peak = layer_scaler.process(
-                            boosted,
-                            peak_hold_frames=settings.peak.hold_frames,
-                            peak_fall_speed=settings.peak.fall_speed
-                        )
-                        smoothed_layers.append(np.clip(layer_smoothed, 0, 1))
-                        layer_peaks.append(layer_peak)
-                
-                # Draw visualization
-                if smoothed_layers is not None and visualizer.layers_enabled:
-                    visualizer.draw(
-                        app.canvas,
-                        smoothed,
-                        None,
-                        layer_bars=smoothed_layers,
-                        layer_peaks=layer_peaks
-                    )
-                else:
-                    visualizer.draw(
-                        app.canvas,
-                        smoothed,
-                        None
-                    )
-                
-                # Draw peaks as independent overlay (only for non-layered mode)
-                if settings.peak.enabled and not visualizer.layers_enabled:
-                    draw_peaks(
-                        app.canvas,
-                        peaks,
-                        theme_cycler._get_current_theme(),
-                        settings,
-                        app.height
-                    )
+                # Scale and draw for the current mode
+                render_frame(bars, layer_bars_raw)
                 
                 # Swap buffers
                 app.swap_canvas()
                 
-                # Frame delay
-                time.sleep(settings.audio.sleep_delay)
+                # Frame delay (returns early if new audio arrives)
+                _pace()
 
-                now = time.time()
+                now = _now()
                 if state_dirty or (now - last_state_save_time) >= state_save_interval:
                     save_runtime_state(build_runtime_state())
                     last_state_save_time = now
+                    # Collect at checkpoints instead of letting GC fire mid-frame
+                    gc.collect(0 if state_dirty else 1)
                 
     except KeyboardInterrupt:
         print("\nExiting...")
@@ -822,6 +1047,7 @@ def main():
         print(f"Runtime error: {e}")
         raise
     finally:
+        gc.enable()
         try:
             save_runtime_state(build_runtime_state())
         except Exception:
@@ -0,0 +1,72 @@
+"""Tests for visualizers.bars_dual.BarsDualVisualizer."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+
+from config import Settings
+from themes import get_theme
+from visualizers.bars_dual import BarsDualVisualizer
+
+
+class RecordingCanvas:
+    """Canvas stand-in that records every SetPixel call."""
+
+    def __init__(self):
+        self.pixels = []
+
+    def Clear(self):
+        self.pixels.clear()
+
+    def SetPixel(self, x, y, r, g, b):
+        self.pixels.append((x, y, int(r), int(g), int(b)))
+
+
+def _expected_pixels(viz, base_bars, top_bars):
+    """Per-pixel reference: one get_color/_get_top_color call per pixel."""
+    height = viz.height
+    pixels = []
+    for i, value in enumerate(base_bars):
+        value = min(1.0, max(0.0, value))
+        for j in range(int(value * height)):
+            if viz.gradient_mode:
+                color = viz.theme.get_color(j / height, i / len(base_bars))
+            else:
+                color = viz.theme.get_color(value, i / len(base_bars))
+            pixels.append((i, height - 1 - j) + tuple(color))
+    bar_width = viz.width // len(top_bars)
+    for i, value in enumerate(top_bars):
+        value = min(1.0, max(0.0, value))
+        for x in range(i * bar_width, min(i * bar_width + bar_width, viz.width)):
+            for j in range(int(value * height)):
+                ratio = j / height if viz.gradient_mode else value
+                color = viz._get_top_color(ratio, i / len(top_bars))
+                pixels.append((x, height - 1 - j) + tuple(color))
+    return pixels
+
+
+def test_constructs_from_default_settings():
+    viz = BarsDualVisualizer(64, 64, Settings())
+    assert viz.dual_enabled is False
+    assert viz.get_top_color_mode() == 'overflow'
+
+
+@pytest.mark.parametrize('gradient', [True, False])
+@pytest.mark.parametrize('top_color_mode', ['overflow', 'warm', 'rainbow'])
+def test_column_path_matches_per_pixel_colors(gradient, top_color_mode):
+    settings = Settings()
+    settings.dual.enabled = True
+    settings.dual.top_color_mode = top_color_mode
+    viz = BarsDualVisualizer(64, 64, settings)
+    viz.set_theme(get_theme('ocean'))
+    viz.gradient_mode = gradient
+
+    rng = np.random.default_rng(0)
+    base_bars = rng.uniform(-0.1, 1.2, 64).astype(np.float32)
+    top_bars = rng.uniform(-0.1, 1.2, 16).astype(np.float32)
+
+    canvas = RecordingCanvas()
+    viz.draw(canvas, base_bars, top_bars=top_bars)
+    assert canvas.pixels == _expected_pixels(viz, base_bars.tolist(), top_bars.tolist())
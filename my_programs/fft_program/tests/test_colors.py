@@ -0,0 +1,22 @@
+"""Tests for utils.colors."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import colorsys
+
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+
+from utils.colors import hsv_to_rgb_array
+
+
+@pytest.mark.parametrize('saturation, value', [(1.0, 1.0), (0.85, 0.9), (0.0, 0.5), (0.3, 1.0)])
+def test_hsv_to_rgb_array_matches_colorsys(saturation, value):
+    """Every element equals int(channel * 255) of colorsys.hsv_to_rgb."""
+    hues = np.concatenate([np.arange(361) / 360, np.random.default_rng(0).random(5000)])
+    expected = np.array([
+        [int(c * 255) for c in colorsys.hsv_to_rgb(h, saturation, value)]
+        for h in hues.tolist()
+    ])
+    np.testing.assert_array_equal(hsv_to_rgb_array(hues, saturation, value), expected)
@@ -0,0 +1,34 @@
+"""Tests for core.pacing.FramePacer."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+from core.pacing import FramePacer
+
+
+def test_early_wakes_keep_deadline_within_one_interval():
+    """Data arriving faster than the frame interval must not push the deadline ahead."""
+    wakes = []
+
+    def wake(timeout):
+        wakes.append(timeout)
+        return True  # New data every time: always woken immediately
+
+    pacer = FramePacer(0.05, wake=wake)
+    for _ in range(100):
+        pacer.wait()
+        assert pacer._deadline_ns - time.monotonic_ns() <= pacer.interval_ns
+
+    assert len(wakes) == 100
+    assert all(timeout <= pacer.interval for timeout in wakes)
+
+
+def test_timeout_wait_keeps_absolute_schedule():
+    """A wait that runs to its timeout leaves the absolute deadline in place."""
+    pacer = FramePacer(0.01, wake=lambda timeout: False)
+    start_ns = pacer._deadline_ns
+    pacer.wait()
+    pacer.wait()
+    assert pacer._deadline_ns == start_ns + 2 * pacer.interval_ns
@@ -0,0 +1,47 @@
+"""Tests for core.scaling.ScalingProcessor."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+
+import core.scaling
+from config.settings import ScalingSettings, SensitivitySettings, SmoothingSettings
+from core.scaling import ScalingProcessor
+
+
+def _make_processor(num_bins=64):
+    return ScalingProcessor(ScalingSettings(), SensitivitySettings(), SmoothingSettings(), num_bins)
+
+
+def _run(frames):
+    processor = _make_processor()
+    for bars in frames:
+        normalized, smoothed, peaks = processor.process(bars)
+    return normalized.copy(), smoothed.copy(), peaks.copy()
+
+
+@pytest.mark.parametrize('numba', [True, False])
+def test_process_accepts_float64(monkeypatch, numba):
+    """float64 input (e.g. np.zeros) works on both the compiled and NumPy path."""
+    monkeypatch.setattr(core.scaling, 'NUMBA_AVAILABLE', numba and core.scaling.NUMBA_AVAILABLE)
+    rng = np.random.default_rng(0)
+    frames = [np.zeros(64)] + [rng.uniform(0, 2, 64) for _ in range(20)]
+    normalized, smoothed, peaks = _run(frames)
+    assert smoothed.dtype == np.float32
+    assert np.all(np.isfinite(normalized))
+    assert np.all(np.isfinite(peaks))
+
+
+def test_compiled_and_numpy_paths_agree(monkeypatch):
+    """Both implementations give the same result for the same float64 input."""
+    if not core.scaling.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    rng = np.random.default_rng(1)
+    frames = [rng.uniform(0, 2, 64) for _ in range(30)]
+    compiled = _run(frames)
+    monkeypatch.setattr(core.scaling, 'NUMBA_AVAILABLE', False)
+    fallback = _run(frames)
+    for a, b in zip(compiled, fallback):
+        np.testing.assert_allclose(a, b, rtol=1e-5, atol=1e-6)
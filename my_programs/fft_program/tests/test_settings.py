@@ -0,0 +1,34 @@
+"""Tests for config.settings."""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # type: ignore
+import pytest  # type: ignore
+
+from config.settings import PeakColorMode, PeakSettings
+from themes import get_theme
+
+
+def test_peak_color_mode_normalized_on_assignment():
+    """Names and ints assigned after construction become PeakColorMode."""
+    peak = PeakSettings(color_mode='white')
+    assert peak.color_mode is PeakColorMode.WHITE
+    peak.color_mode = 'bar'
+    assert peak.color_mode is PeakColorMode.BAR
+    peak.color_mode = 3
+    assert peak.color_mode is PeakColorMode.PEAK
+    with pytest.raises(ValueError):
+        peak.color_mode = 'sparkle'
+
+
+@pytest.mark.parametrize('name', ['white', 'bar', 'contrast', 'peak'])
+def test_scalar_and_array_peak_colors_agree(name):
+    """A mode assigned by name gives the same colors on both get_peak_color paths."""
+    peak = PeakSettings()
+    peak.color_mode = name
+    theme = get_theme('ocean')
+    bar_color = (10, 120, 200)
+    scalar = theme.get_peak_color(peak.color_mode, bar_color, 0.25)
+    array = theme.get_peak_color(peak.color_mode, np.array([bar_color], dtype=np.uint8), np.array([0.25]))
+    assert tuple(array[0].tolist()) == tuple(scalar)
@@ -1,11 +1,19 @@
 """
 Base theme class for FFT visualizer color schemes.
 
-Uses direct color calculation (not LUT) for best performance
-on small displays like 64x64 LED matrices.
+Uses direct color calculation for single pixels. Static themes can also
+build a per-pixel color table at display resolution, so whole columns
+are looked up with one NumPy index instead of one get_color call each.
 """
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Dict, Optional, Tuple
+import numpy as np  # type: ignore
+
+from config.settings import PeakColorMode
+
+# Color tables shared by all instances of a theme class:
+# (theme class, width, height, brightness_boost) -> (color table, overflow table)
+_LUT_CACHE: Dict[Tuple[type, int, int, float], Tuple[np.ndarray, np.ndarray]] = {}
 
 
 class BaseTheme(ABC):
@@ -13,6 +21,8 @@ class BaseTheme(ABC):
     
     name: str = "base"
     description: str = "Base theme"
+    animated: bool = False  # True = colors change over time (never tabulated)
+    overflow_layers: int = 4  # Overflow layers tabulated; higher layers reuse the last
     
     def __init__(self, brightness_boost: float = 1.0):
         """
@@ -22,6 +32,12 @@ class BaseTheme(ABC):
             brightness_boost: Overall brightness multiplier (1.0 = normal)
         """
         self.brightness_boost = brightness_boost
+        # Boosted value of every 0-255 channel input, for _apply_brightness
+        self._brightness_lut: Tuple[int, ...] = tuple(
+            min(255, int(v * brightness_boost)) for v in range(256)
+        )
+        self._lut: Optional[np.ndarray] = None
+        self._overflow_lut: Optional[np.ndarray] = None
     
     @abstractmethod
     def get_color(
@@ -41,6 +57,149 @@ class BaseTheme(ABC):
         """
         pass
     
+    def get_colors_vec(self, height_ratios, column_ratios) -> np.ndarray:
+        """
+        Compute get_color for many pixels at once (exact, no table).
+        
+        Default calls get_color per pixel; themes override it with the same
+        formulas written as whole-array NumPy operations.
+        
+        Args:
+            height_ratios: 0-1 height ratio(s), scalar or array
+            column_ratios: 0-1 column ratio(s), scalar or array
+        
+        Returns:
+            uint8 array of shape broadcast(height_ratios, column_ratios) + (3,)
+        """
+        hr, cr = np.broadcast_arrays(np.asarray(height_ratios), np.asarray(column_ratios))
+        colors = [self.get_color(h, c) for h, c in zip(hr.ravel().tolist(), cr.ravel().tolist())]
+        return np.array(colors, dtype=np.uint8).reshape(hr.shape + (3,))
+    
+    def build_lut(self, width: int, height: int) -> Optional[np.ndarray]:
+        """
+        Tabulate get_color at every pixel position of a width x height display.
+        
+        Entry [i, j] holds get_color(i / height, j / width), so the ratios the
+        draw loops use (row / height, col / width) index it exactly without
+        banding. get_overflow_color is tabulated the same way for layers
+        0 to overflow_layers - 1. Tables are cached per (theme class, size,
+        brightness). Animated themes are not tabulated.
+        
+        Args:
+            width: Display width in pixels
+            height: Display height in pixels
+        
+        Returns:
+            (height+1, width+1, 3) uint8 color table, or None if animated
+        """
+        if self.animated:
+            self._lut = None
+            self._overflow_lut = None
+            return None
+        
+        key = (type(self), width, height, self.brightness_boost)
+        tables = _LUT_CACHE.get(key)
+        if tables is None:
+            lut = self.get_colors_vec(
+                (np.arange(height + 1) / height)[:, None],
+                (np.arange(width + 1) / width)[None, :]
+            )
+            overflow_lut = np.empty((self.overflow_layers, height + 1, width + 1, 3), dtype=np.uint8)
+            for i in range(height + 1):
+                for j in range(width + 1):
+                    for layer in range(self.overflow_layers):
+                        overflow_lut[layer, i, j] = self.get_overflow_color(layer, i / height, j / width)
+            lut.setflags(write=False)
+            overflow_lut.setflags(write=False)
+            tables = (lut, overflow_lut)
+            _LUT_CACHE[key] = tables
+        self._lut, self._overflow_lut = tables
+        return self._lut
+    
+    def get_color_array(self, height_ratios, column_ratios) -> np.ndarray:
+        """
+        Get colors for many pixels at once.
+        
+        Ratios are broadcast against each other and rounded to the nearest
+        entry of the table from build_lut(). Without a table (not built yet,
+        or animated theme) colors are computed with get_colors_vec.
+        
+        Args:
+            height_ratios: 0-1 height ratio(s), scalar or array
+            column_ratios: 0-1 column ratio(s), scalar or array
+        
+        Returns:
+            uint8 array of shape broadcast(height_ratios, column_ratios) + (3,)
+        """
+        lut = self._lut
+        if lut is None:
+            return self.get_colors_vec(height_ratios, column_ratios)
+        
+        max_h = lut.shape[0] - 1
+        max_c = lut.shape[1] - 1
+        hi = np.clip(np.rint(np.multiply(height_ratios, max_h)), 0, max_h).astype(np.intp)
+        ci = np.clip(np.rint(np.multiply(column_ratios, max_c)), 0, max_c).astype(np.intp)
+        return lut[hi, ci]
+    
+    def get_color_column(self, height_ratios: np.ndarray, column_ratio: float) -> np.ndarray:
+        """
+        Get colors for one column of pixels.
+        
+        Default looks the column up in the color table (or computes it with
+        get_colors_vec without one). Themes that cannot be tabulated override
+        this with a vectorized calculation.
+        
+        Args:
+            height_ratios: 0-1 height ratio of each pixel
+            column_ratio: 0-1 column position
+        
+        Returns:
+            (N, 3) uint8 array of colors
+        """
+        return self.get_color_array(height_ratios, column_ratio)
+    
+    def get_overflow_color_batch(
+        self,
+        layers: np.ndarray,
+        height_ratios: np.ndarray,
+        column_ratios,
+        frame: int = 0,
+        bar_ratio: float = 0.0
+    ) -> np.ndarray:
+        """
+        Get overflow colors for many pixels at once.
+        
+        Looks every pixel up in the overflow table from build_lut() with one
+        index; layers past overflow_layers - 1 use the last tabulated layer.
+        Without a table each color is computed with get_overflow_color.
+        
+        Args:
+            layers: Overflow layer number per pixel
+            height_ratios: 0-1 value within each pixel's layer
+            column_ratios: 0-1 column position(s), scalar or array
+            frame: Current frame number (animated themes only)
+            bar_ratio: Total bar height ratio (animated themes only)
+        
+        Returns:
+            uint8 array of shape broadcast(layers, height_ratios, column_ratios) + (3,)
+        """
+        table = self._overflow_lut
+        if table is None:
+            ls, hr, cr = np.broadcast_arrays(layers, height_ratios, np.asarray(column_ratios))
+            colors = [
+                self.get_overflow_color(l, h, c, frame, bar_ratio)
+                for l, h, c in zip(ls.ravel().tolist(), hr.ravel().tolist(), cr.ravel().tolist())
+            ]
+            return np.array(colors, dtype=np.uint8).reshape(hr.shape + (3,))
+        
+        max_l = table.shape[0] - 1
+        max_h = table.shape[1] - 1
+        max_c = table.shape[2] - 1
+        li = np.clip(layers, 0, max_l)
+        hi = np.clip(np.rint(np.multiply(height_ratios, max_h)), 0, max_h).astype(np.intp)
+        ci = np.clip(np.rint(np.multiply(column_ratios, max_c)), 0, max_c).astype(np.intp)
+        return table[li, hi, ci]
+    
     def get_overflow_color(
         self,
         layer: int,
@@ -85,37 +244,69 @@ class BaseTheme(ABC):
     
     def get_peak_color(
         self,
-        mode: str,
+        mode: int,
         bar_color: Tuple[int, int, int],
         column_ratio: float = 0.0
     ) -> Tuple[int, int, int]:
         """
         Get RGB color for peak indicator.
         
+        Also accepts a (N, 3) uint8 array of bar colors with matching
+        column ratios, returning a (N, 3) uint8 array.
+        
         Args:
-            mode: Peak color mode ('white', 'bar', 'contrast', 'peak')
+            mode: PeakColorMode value (WHITE, BAR, CONTRAST, PEAK)
             bar_color: Current bar color for reference
             column_ratio: Column position for position-based themes
         
         Returns:
             Tuple of (r, g, b) values 0-255
         """
-        if mode == 'white':
-            return (255, 255, 255)
-        elif mode == 'bar':
-            return bar_color
-        elif mode == 'contrast':
-            return (255 - bar_color[0], 255 - bar_color[1], 255 - bar_color[2])
-        elif mode == 'peak':
-            # Use the color for max height (ratio = 1.0)
-            return self.get_color(1.0, column_ratio)
-        else:
-            return (255, 255, 255)
+        if isinstance(bar_color, np.ndarray):
+            if mode == PeakColorMode.BAR:
+                return bar_color
+            elif mode == PeakColorMode.CONTRAST:
+                return 255 - bar_color
+            elif mode == PeakColorMode.PEAK:
+                return self.get_color_array(1.0, column_ratio)
+            return np.full_like(bar_color, 255)
+        
+        return self._PEAK_HANDLERS[mode](self, bar_color, column_ratio)
+    
+    def _peak_white(self, bar_color: Tuple[int, int, int], column_ratio: float) -> Tuple[int, int, int]:
+        return (255, 255, 255)
+    
+    def _peak_bar(self, bar_color: Tuple[int, int, int], column_ratio: float) -> Tuple[int, int, int]:
+        return bar_color
+    
+    def _peak_contrast(self, bar_color: Tuple[int, int, int], column_ratio: float) -> Tuple[int, int, int]:
+        return (255 - bar_color[0], 255 - bar_color[1], 255 - bar_color[2])
+    
+    def _peak_peak(self, bar_color: Tuple[int, int, int], column_ratio: float) -> Tuple[int, int, int]:
+        # Use the color for max height (ratio = 1.0)
+        return self.get_color(1.0, column_ratio)
+    
+    # Jump table indexed by PeakColorMode value (one tuple index, no compare chain)
+    _PEAK_HANDLERS = (_peak_white, _peak_bar, _peak_contrast, _peak_peak)
     
     def _apply_brightness(self, r: int, g: int, b: int) -> Tuple[int, int, int]:
         """Apply brightness boost and clamp to valid range."""
+        if r >= 0 and g >= 0 and b >= 0:
+            try:
+                lut = self._brightness_lut
+                return lut[r], lut[g], lut[b]
+            except (IndexError, TypeError):
+                pass  # Out-of-range or non-int channel: compute directly
         return (
             min(255, int(r * self.brightness_boost)),
             min(255, int(g * self.brightness_boost)),
             min(255, int(b * self.brightness_boost))
         )
+    
+    def _apply_brightness_vec(self, rgb: np.ndarray) -> np.ndarray:
+        """Array form of _apply_brightness: (..., 3) values -> clamped uint8."""
+        return np.minimum(np.multiply(rgb, self.brightness_boost, dtype=np.float64), 255).astype(np.uint8)
+    
+    def _rgb_vec(self, r, g, b) -> np.ndarray:
+        """Stack channel values/arrays into (..., 3) and apply brightness."""
+        return self._apply_brightness_vec(np.stack(np.broadcast_arrays(r, g, b), axis=-1))
@@ -4,10 +4,11 @@ Gradient-based color themes for FFT visualizer.
 Direct color calculation for best performance on LED matrices.
 """
 import colorsys
-import math
 import random
 import time
-from typing import Tuple
+from typing import Dict, Tuple
+import numpy as np  # type: ignore
+from utils.colors import hsv_to_rgb_array
 from .base import BaseTheme
 
 
@@ -36,6 +37,15 @@ class WarmTheme(BaseTheme):
         
         return self._apply_brightness(r, g, b)
     
+    def get_colors_vec(self, height_ratios, column_ratios):
+        ratio, _ = np.broadcast_arrays(np.asarray(height_ratios), np.asarray(column_ratios))
+        g = np.where(
+            ratio < 0.5,
+            np.trunc(165 * (ratio / 0.5)),          # Red to Orange
+            np.trunc(165 + 90 * ((ratio - 0.5) / 0.5))  # Orange to Yellow
+        )
+        return self._rgb_vec(255, g, 0)
+    
     def get_overflow_color(self, layer: int, height_ratio: float, column_ratio: float = 0.0, frame: int = 0, bar_ratio: float = 0.0) -> Tuple[int, int, int]:
         """Warm overflow: Orange -> Yellow -> White hot."""
         if layer == 0:
@@ -61,11 +71,19 @@ class OceanTheme(BaseTheme):
     
     def get_color(self, height_ratio: float, column_ratio: float = 0.0) -> Tuple[int, int, int]:
         ratio = height_ratio
-        r = int(255 * (ratio ** 2))
+        r = int(255 * (ratio * ratio))
         g = int(255 * ratio)
         b = int(255 * (0.5 + ratio * 0.5))
         return self._apply_brightness(r, g, b)
     
+    def get_colors_vec(self, height_ratios, column_ratios):
+        ratio, _ = np.broadcast_arrays(np.asarray(height_ratios), np.asarray(column_ratios))
+        return self._rgb_vec(
+            np.trunc(255 * (ratio * ratio)),
+            np.trunc(255 * ratio),
+            np.trunc(255 * (0.5 + ratio * 0.5))
+        )
+    
     def get_overflow_color(self, layer: int, height_ratio: float, column_ratio: float = 0.0, frame: int = 0, bar_ratio: float = 0.0) -> Tuple[int, int, int]:
         """Ocean overflow: Theme -> Cyan/White -> Bright white (cool tones only)."""
         if layer == 0:
@@ -96,6 +114,14 @@ class ForestTheme(BaseTheme):
         b = 0
         return self._apply_brightness(r, g, b)
     
+    def get_colors_vec(self, height_ratios, column_ratios):
+        ratio, _ = np.broadcast_arrays(np.asarray(height_ratios), np.asarray(column_ratios))
+        return self._rgb_vec(
+            np.trunc(255 * (ratio ** 1.5)),
+            np.trunc(255 * (0.3 + ratio * 0.7)),
+            0
+        )
+    
     def get_overflow_color(self, layer: int, height_ratio: float, column_ratio: float = 0.0, frame: int = 0, bar_ratio: float = 0.0) -> Tuple[int, int, int]:
         """Forest overflow: Yellow -> Gold -> Sunlight white."""
         if layer == 0:
@@ -114,6 +140,10 @@ class ForestTheme(BaseTheme):
 
 
 
+# Max cached (layer, column) colors per RainbowTheme before the cache resets
+_COLUMN_CACHE_SIZE = 4096
+
+
 class RainbowTheme(BaseTheme):
     """Full spectrum based on bar position (column), full brightness throughout."""
     
@@ -129,33 +159,49 @@ class RainbowTheme(BaseTheme):
     
     def _hue_to_rgb(self, hue: float) -> Tuple[float, float, float]:
         """Convert hue (0-300) to RGB components (0-1 range)."""
-        c = 1.0
-        x = c * (1 - abs((hue / 60) % 2 - 1))
+        return colorsys.hsv_to_rgb(hue / 360, 1.0, 1.0)
+    
+    def __init__(self, brightness_boost: float = 1.0):
+        """
+        Initialize rainbow theme.
         
-        if hue < 60:
-            return c, x, 0
-        elif hue < 120:
-            return x, c, 0
-        elif hue < 180:
-            return 0, c, x
-        elif hue < 240:
-            return 0, x, c
-        elif hue < 300:
-            return x, 0, c
-        else:
-            return c, 0, x
+        Args:
+            brightness_boost: Overall brightness multiplier (1.0 = normal)
+        """
+        super().__init__(brightness_boost)
+        # Colors depend only on column (and overflow layer), and columns are
+        # fixed per display: (layer, column_ratio) -> color, layer 0 = bars
+        self._column_colors: Dict[Tuple[int, float], Tuple[int, int, int]] = {}
+    
+    def _cache_column_color(self, key: Tuple[int, float], color: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        """Remember a column color, bounding the cache for arbitrary ratios."""
+        if len(self._column_colors) >= _COLUMN_CACHE_SIZE:
+            self._column_colors.clear()
+        self._column_colors[key] = color
+        return color
     
     def get_color(self, height_ratio: float, column_ratio: float = 0.0) -> Tuple[int, int, int]:
+        color = self._column_colors.get((0, column_ratio))
+        if color is not None:
+            return color
         hue = self._adjusted_hue(column_ratio)
         r, g, b = self._hue_to_rgb(hue)
         r, g, b = int(r * 255), int(g * 255), int(b * 255)
-        return self._apply_brightness(r, g, b)
+        return self._cache_column_color((0, column_ratio), self._apply_brightness(r, g, b))
+    
+    def get_colors_vec(self, height_ratios, column_ratios):
+        _, column = np.broadcast_arrays(np.asarray(height_ratios), np.asarray(column_ratios))
+        hue = self._adjusted_hue(column)
+        return self._apply_brightness_vec(hsv_to_rgb_array(hue / 360, 1.0, 1.0))
     
     def get_overflow_color(self, layer: int, height_ratio: float, column_ratio: float = 0.0, frame: int = 0, bar_ratio: float = 0.0) -> Tuple[int, int, int]:
         """Rainbow overflow: Continue rainbow with increasing brightness/white."""
         if layer == 0:
             return self.get_color(height_ratio, column_ratio)
         else:
+            color = self._column_colors.get((layer, column_ratio))
+            if color is not None:
+                return color
             # Higher layers: rainbow colors washed toward white
             hue = self._adjusted_hue(column_ratio)
             # More white blend as layers increase
@@ -166,7 +212,7 @@ class RainbowTheme(BaseTheme):
             r = int((r * (1 - white_blend) + white_blend) * 255)
             g = int((g * (1 - white_blend) + white_blend) * 255)
             b = int((b * (1 - white_blend) + white_blend) * 255)
-            return self._apply_brightness(r, g, b)
+            return self._cache_column_color((layer, column_ratio), self._apply_brightness(r, g, b))
 
 
 class AutumnTheme(BaseTheme):
@@ -199,6 +245,17 @@ class AutumnTheme(BaseTheme):
 
         return self._apply_brightness(r, g, b)
 
+    def get_colors_vec(self, height_ratios, column_ratios):
+        ratio, _ = np.broadcast_arrays(np.asarray(height_ratios), np.asarray(column_ratios))
+        low = ratio < 0.33
+        mid = ratio < 0.66
+        norm = np.select([low, mid], [ratio / 0.33, (ratio - 0.33) / 0.33], (ratio - 0.66) / 0.34)
+        return self._rgb_vec(
+            np.trunc(np.select([low, mid], [100 + 55 * norm, 155 + 85 * norm], 240 + 15 * norm)),
+            np.trunc(np.select([low, mid], [40 + 20 * norm, 60 + 60 * norm], 120 + 100 * norm)),
+            np.trunc(np.select([low, mid], [10 + 5 * norm, 15 - 10 * norm], 5 + 15 * norm))
+        )
+    
     def get_overflow_color(self, layer: int, height_ratio: float, column_ratio: float = 0.0, frame: int = 0, bar_ratio: float = 0.0) -> Tuple[int, int, int]:
         """Autumn overflow: Crimson red -> Bright gold -> Warm white."""
         if layer == 0:
@@ -221,6 +278,7 @@ class DynamicLateralGradientTheme(BaseTheme):
 
     name = "dynamic_lateral_gradient"
     description = "Animated full-spectrum cycling with lateral gradient drift"
+    animated = True
 
     def __init__(
         self,
@@ -308,6 +366,27 @@ class DynamicLateralGradientTheme(BaseTheme):
         r_f, g_f, b_f = colorsys.hsv_to_rgb(hue, self.saturation, self.value)
         return self._apply_brightness(int(r_f * 255), int(g_f * 255), int(b_f * 255))
 
+    def _hsv_colors(self, hues: np.ndarray) -> np.ndarray:
+        """Array form of colorsys.hsv_to_rgb + brightness: hues (N,) -> (N, 3) uint8."""
+        return self._apply_brightness_vec(hsv_to_rgb_array(hues, self.saturation, self.value))
+
+    def get_colors_vec(self, height_ratios, column_ratios):
+        return self._hsv_colors(self._animated_hue(np.asarray(height_ratios), np.asarray(column_ratios)))
+
+    def get_color_column(self, height_ratios: np.ndarray, column_ratio: float) -> np.ndarray:
+        return self._hsv_colors(self._animated_hue(height_ratios, column_ratio))
+
+    def get_overflow_color_batch(
+        self,
+        layers: np.ndarray,
+        height_ratios: np.ndarray,
+        column_ratios,
+        frame: int = 0,
+        bar_ratio: float = 0.0,
+    ) -> np.ndarray:
+        hue = self._animated_hue(height_ratios, column_ratios, layer_shift=layers * 0.12)
+        return self._hsv_colors(hue)
+
 
 class DynamicTheme(DynamicLateralGradientTheme):
     """Animated full-spectrum theme with horizontal consistency (no column hue drift)."""
@@ -5,9 +5,10 @@ Provides a centralized way to access themes by name.
 """
 import sys
 import os
+import functools
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import Dict, Type, Optional, List
+from typing import Dict, Type, Optional, List, Tuple
 from themes.base import BaseTheme
 from themes.gradients import (
     WarmTheme,
@@ -19,13 +20,10 @@ from themes.gradients import (
     DynamicLateralGradientTheme,
 )
 
-# Global theme registry
-_THEME_REGISTRY: Dict[str, Type[BaseTheme]] = {}
-
-
-def _register_builtin_themes():
-    """Register all built-in themes."""
-    builtin_themes = [
+# Global theme registry, filled with the built-in themes at import
+_THEME_REGISTRY: Dict[str, Type[BaseTheme]] = {
+    theme_class.name: theme_class
+    for theme_class in (
         WarmTheme,
         OceanTheme,
         ForestTheme,
@@ -33,9 +31,11 @@ def _register_builtin_themes():
         AutumnTheme,
         DynamicTheme,
         DynamicLateralGradientTheme,
-    ]
-    for theme_class in builtin_themes:
-        _THEME_REGISTRY[theme_class.name] = theme_class
+    )
+}
+
+# Shared instances of static themes: (name, brightness_boost) -> theme
+_THEME_INSTANCES: Dict[Tuple[str, float], BaseTheme] = {}
 
 
 def register_theme(theme_class: Type[BaseTheme]) -> None:
@@ -48,12 +48,20 @@ def register_theme(theme_class: Type[BaseTheme]) -> None:
     if not hasattr(theme_class, 'name'):
         raise ValueError("Theme class must have a 'name' attribute")
     _THEME_REGISTRY[theme_class.name] = theme_class
+    _sorted_theme_names.cache_clear()
+    for key in [key for key in _THEME_INSTANCES if key[0] == theme_class.name]:
+        del _THEME_INSTANCES[key]
 
 
 def get_theme(name: str, brightness_boost: float = 1.0) -> BaseTheme:
     """
     Get a theme instance by name.
     
+    Static themes are stateless, so one instance per (name, brightness)
+    is shared and cycling back to a theme costs a dict lookup. Animated
+    themes keep per-instance state (speed, hue, freeze) and are always
+    created fresh.
+    
     Args:
         name: Theme name (e.g., 'fire', 'ocean', 'rainbow')
         brightness_boost: Brightness multiplier to apply
@@ -64,14 +72,26 @@ def get_theme(name: str, brightness_boost: float = 1.0) -> BaseTheme:
     Raises:
         KeyError: If theme name is not found
     """
-    if not _THEME_REGISTRY:
-        _register_builtin_themes()
-    
     if name not in _THEME_REGISTRY:
         available = ', '.join(sorted(_THEME_REGISTRY.keys()))
         raise KeyError(f"Unknown theme '{name}'. Available themes: {available}")
     
-    return _THEME_REGISTRY[name](brightness_boost=brightness_boost)
+    theme_class = _THEME_REGISTRY[name]
+    if theme_class.animated:
+        return theme_class(brightness_boost=brightness_boost)
+    
+    key = (name, brightness_boost)
+    theme = _THEME_INSTANCES.get(key)
+    if theme is None:
+        theme = theme_class(brightness_boost=brightness_boost)
+        _THEME_INSTANCES[key] = theme
+    return theme
+
+
+@functools.lru_cache(maxsize=1)
+def _sorted_theme_names() -> Tuple[str, ...]:
+    """Sorted registered theme names (cleared by register_theme)."""
+    return tuple(sorted(_THEME_REGISTRY.keys()))
 
 
 def list_themes() -> List[str]:
@@ -81,9 +101,7 @@ def list_themes() -> List[str]:
     Returns:
         Sorted list of theme names
     """
-    if not _THEME_REGISTRY:
-        _register_builtin_themes()
-    return sorted(_THEME_REGISTRY.keys())
+    return list(_sorted_theme_names())
 
 
 def get_theme_info() -> Dict[str, str]:
@@ -93,10 +111,5 @@ def get_theme_info() -> Dict[str, str]:
     Returns:
         Dict mapping theme name to description
     """
-    if not _THEME_REGISTRY:
-        _register_builtin_themes()
     return {name: cls.description for name, cls in _THEME_REGISTRY.items()}
 
-
-# Initialize built-in themes on module load
-_register_builtin_themes()
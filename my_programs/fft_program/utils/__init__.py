@@ -3,6 +3,6 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.colors import hsv_to_rgb, clamp_color
+from utils.colors import hsv_to_rgb, hsv_to_rgb_array, clamp_color
 
-__all__ = ['hsv_to_rgb', 'clamp_color']
+__all__ = ['hsv_to_rgb', 'hsv_to_rgb_array', 'clamp_color']
@@ -2,6 +2,7 @@
 Color utility functions for FFT visualizer.
 """
 from typing import Tuple
+import numpy as np  # type: ignore
 
 
 def hsv_to_rgb(hue: float, saturation: float, value: float) -> Tuple[int, int, int]:
@@ -40,6 +41,37 @@ def hsv_to_rgb(hue: float, saturation: float, value: float) -> Tuple[int, int, i
     )
 
 
+def hsv_to_rgb_array(hue, saturation: float, value: float) -> np.ndarray:
+    """
+    Convert an array of hues to RGB (vectorized colorsys.hsv_to_rgb).
+    
+    Uses the same float operations as colorsys, so every element equals
+    int(channel * 255) of colorsys.hsv_to_rgb(hue, saturation, value).
+    
+    Args:
+        hue: Hue values (0-1, wraps around), scalar or array
+        saturation: Saturation (0-1)
+        value: Value/brightness (0-1)
+    
+    Returns:
+        uint8 array of shape hue.shape + (3,)
+    """
+    hue = np.asarray(hue, dtype=np.float64)
+    i = (hue * 6.0).astype(np.intp)
+    f = hue * 6.0 - i
+    p = np.full_like(f, value * (1.0 - saturation))
+    q = value * (1.0 - saturation * f)
+    t = value * (1.0 - saturation * (1.0 - f))
+    v = np.full_like(f, value)
+    i %= 6
+    rgb = np.stack((
+        np.choose(i, (v, q, p, p, t, v)),
+        np.choose(i, (t, v, v, q, p, p)),
+        np.choose(i, (p, p, t, v, v, q)),
+    ), axis=-1)
+    return np.trunc(rgb * 255).astype(np.uint8)
+
+
 def clamp_color(r: int, g: int, b: int) -> Tuple[int, int, int]:
     """
     Clamp RGB values to valid 0-255 range.
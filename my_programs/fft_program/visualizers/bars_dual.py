@@ -27,6 +27,9 @@ class BarsDualVisualizer(BaseVisualizer):
     def __init__(self, width: int, height: int, settings):
         super().__init__(width, height, settings)
         
+        # Height ratio of every row (row / height), for per-column color lookups
+        self._row_ratios = np.arange(height + 1) / height
+        
         # Mode flags
         self.gradient_mode = getattr(settings, 'gradient_enabled', False)
         self.dual_enabled = settings.dual.enabled
@@ -52,6 +55,7 @@ class BarsDualVisualizer(BaseVisualizer):
             self.top_theme = None
         else:
             self.top_theme = get_theme(mode)
+            self.top_theme.build_lut(self.width, self.height)
     
     def toggle_dual(self) -> bool:
         """Toggle dual mode. Returns new state."""
@@ -137,12 +141,10 @@ class BarsDualVisualizer(BaseVisualizer):
             column_ratio = i / num_bins
             
             if self.gradient_mode:
-                # Per-pixel gradient
-                for j in range(bar_height):
-                    y = height - 1 - j
-                    height_ratio = j / height
-                    r, g, b = self.theme.get_color(height_ratio, column_ratio)
-                    canvas.SetPixel(i, y, r, g, b)
+                # Per-pixel gradient: whole column in one theme call
+                colors = self.theme.get_color_column(self._row_ratios[:bar_height], column_ratio)
+                for j, (r, g, b) in enumerate(colors.tolist()):
+                    canvas.SetPixel(i, height - 1 - j, r, g, b)
             else:
                 # Uniform color based on bar height
                 r, g, b = self.theme.get_color(bar_value, column_ratio)
@@ -179,20 +181,18 @@ class BarsDualVisualizer(BaseVisualizer):
             
             column_ratio = i / num_top_bins
             
+            if self.gradient_mode:
+                # Per-pixel gradient: one column of colors shared by the slot
+                colors = self._get_top_colors(
+                    self._row_ratios[:bar_height], column_ratio, bar_value
+                ).tolist()
+            else:
+                # Uniform color, computed once for the whole slot
+                colors = [self._get_top_color(bar_value, column_ratio)] * bar_height
+            
             for x in range(x_start, x_end):
-                if self.gradient_mode:
-                    # Per-pixel gradient
-                    for j in range(bar_height):
-                        y = height - 1 - j
-                        height_ratio = j / height
-                        r, g, b = self._get_top_color(height_ratio, column_ratio)
-                        canvas.SetPixel(x, y, r, g, b)
-                else:
-                    # Uniform color
-                    r, g, b = self._get_top_color(bar_value, column_ratio)
-                    for j in range(bar_height):
-                        y = height - 1 - j
-                        canvas.SetPixel(x, y, r, g, b)
+                for j, (r, g, b) in enumerate(colors):
+                    canvas.SetPixel(x, height - 1 - j, r, g, b)
     
     def _get_top_color(self, height_ratio: float, column_ratio: float) -> tuple:
         """
@@ -212,3 +212,22 @@ class BarsDualVisualizer(BaseVisualizer):
                 frame=self.frame_count,
                 bar_ratio=height_ratio
             )
+    
+    def _get_top_colors(self, height_ratios: np.ndarray, column_ratio: float, bar_ratio: float) -> np.ndarray:
+        """
+        Get colors for one column of top layer pixels.
+        
+        Array form of _get_top_color, served from the theme color tables.
+        
+        Returns:
+            (N, 3) uint8 array of colors
+        """
+        if self.top_theme is not None:
+            return self.top_theme.get_color_column(height_ratios, column_ratio)
+        return self.theme.get_overflow_color_batch(
+            np.ones(len(height_ratios), dtype=np.intp),
+            height_ratios,
+            column_ratio,
+            self.frame_count,
+            bar_ratio
+        )
@@ -55,6 +55,10 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         self.full_mode = False    # Full mode: entire screen lit, gradient scaled by FFT
         self.debug_mode = False   # Debug mode shows full screen gradient
         
+        # Row indices and height ratios (j / height), for whole-column color lookups
+        self._rows = np.arange(height + 1)
+        self._row_ratios = self._rows / height
+        
         # Multi-layer mode state
         self.layers_enabled = False
         self.active_layer = 0           # Which layer is being edited (0-indexed)
@@ -122,8 +126,10 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         """
         self.layer_states = []
         for config in layer_configs:
+            theme = get_theme(config.theme_name, brightness_boost=brightness_boost)
+            theme.build_lut(self.width, self.height)
             state = LayerState(
-                theme=get_theme(config.theme_name, brightness_boost=brightness_boost),
+                theme=theme,
                 theme_name=config.theme_name,
                 bars_enabled=config.bars_enabled,
                 gradient_enabled=config.gradient_enabled,
@@ -218,11 +224,13 @@ class BarsUnifiedVisualizer(BaseVisualizer):
     
     def set_layer_theme(self, theme_name: str, brightness_boost: float = 1.0) -> None:
         """Set theme for the active layer."""
+        theme = get_theme(theme_name, brightness_boost=brightness_boost)
+        theme.build_lut(self.width, self.height)
         if self.layers_enabled and self.layer_states:
-            self.layer_states[self.active_layer].theme = get_theme(theme_name, brightness_boost=brightness_boost)
+            self.layer_states[self.active_layer].theme = theme
             self.layer_states[self.active_layer].theme_name = theme_name
         else:
-            self.theme = get_theme(theme_name, brightness_boost=brightness_boost)
+            self.theme = theme
     
     def get_active_layer_info(self) -> Dict[str, Any]:
         """Get info about the currently active layer."""
@@ -264,7 +272,7 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         canvas.Clear()
         
         height = self.height
-        shadow_enabled = self.settings.shadow.enabled and self.shadow_buffer is not None
+        shadow_enabled = self.settings.shadow.enabled
         
         # Debug mode: draw full screen with static color gradient per column
         if self.debug_mode:
@@ -282,7 +290,9 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         # Decay shadow buffer once per frame (vectorized)
         if shadow_enabled:
             self.decay_shadow()
-            self._draw_shadows(canvas, height)
+            # Shadow under this frame's bars would be painted over; skip it
+            covered = self._bar_coverage(smoothed_bars, layer_bars, height) if self.bars_enabled else None
+            self._draw_shadows(canvas, height, covered)
         
         # Skip bar drawing if disabled (peaks-only mode)
         if not self.bars_enabled:
@@ -403,7 +413,7 @@ class BarsUnifiedVisualizer(BaseVisualizer):
     ) -> None:
         """Draw a standard bar for a specific layer (clamped to display height)."""
         bar_value = min(1.0, max(0.0, bar_value))
-        bar_height = int(bar_value * height)
+        bar_height = self._standard_bar_height(bar_value, height)
         
         if bar_height <= 0:
             return
@@ -411,16 +421,14 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         theme = state.theme
         
         if state.gradient_enabled:
-            # Per-pixel gradient
-            for j in range(bar_height):
-                y = height - 1 - j
-                height_ratio = j / height
-                r, g, b = theme.get_color(height_ratio, column_ratio)
-                canvas.SetPixel(col, y, r, g, b)
-                
-                if shadow_enabled:
-                    self.shadow_buffer[col, j] = 1.0
-                    self.shadow_colors[col, j] = (r, g, b)
+            # Per-pixel gradient: whole column in one theme call
+            colors = theme.get_color_column(self._row_ratios[:bar_height], column_ratio)
+            for j, (r, g, b) in enumerate(colors.tolist()):
+                canvas.SetPixel(col, height - 1 - j, r, g, b)
+            
+            if shadow_enabled:
+                self.shadow_buffer[col, :bar_height] = 1.0
+                self.shadow_colors[col, :bar_height] = colors
         else:
             # Uniform color based on bar height
             r, g, b = theme.get_color(bar_value, column_ratio)
@@ -428,10 +436,10 @@ class BarsUnifiedVisualizer(BaseVisualizer):
             for j in range(bar_height):
                 y = height - 1 - j
                 canvas.SetPixel(col, y, r, g, b)
-                
-                if shadow_enabled:
-                    self.shadow_buffer[col, j] = 1.0
-                    self.shadow_colors[col, j] = (r, g, b)
+            
+            if shadow_enabled:
+                self.shadow_buffer[col, :bar_height] = 1.0
+                self.shadow_colors[col, :bar_height] = (r, g, b)
     
     def _draw_bar_overflow_layer(
         self,
@@ -444,8 +452,7 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         shadow_enabled: bool
     ) -> None:
         """Draw a bar with overflow stacking for a specific layer."""
-        overflow = self.settings.overflow
-        total_pixels = int(raw_ratio * height * overflow.multiplier)
+        total_pixels = self._overflow_total_pixels(raw_ratio, height)
         
         if total_pixels <= 0:
             return
@@ -458,23 +465,16 @@ class BarsUnifiedVisualizer(BaseVisualizer):
             remainder = total_pixels % height
             boundary = remainder if remainder > 0 else height
             
-            for j in range(visible_pixels):
-                y = height - 1 - j
-                layer_ratio = j / height
-                
-                if j < boundary:
-                    layer = top_layer
-                else:
-                    layer = top_layer - 1
-                
-                r, g, b = theme.get_overflow_color(
-                    layer, layer_ratio, column_ratio, self.frame_count, raw_ratio
-                )
-                canvas.SetPixel(col, y, r, g, b)
-                
-                if shadow_enabled:
-                    self.shadow_buffer[col, j] = 1.0
-                    self.shadow_colors[col, j] = (r, g, b)
+            layers = np.where(self._rows[:visible_pixels] < boundary, top_layer, top_layer - 1)
+            colors = theme.get_overflow_color_batch(
+                layers, self._row_ratios[:visible_pixels], column_ratio, self.frame_count, raw_ratio
+            )
+            for j, (r, g, b) in enumerate(colors.tolist()):
+                canvas.SetPixel(col, height - 1 - j, r, g, b)
+            
+            if shadow_enabled:
+                self.shadow_buffer[col, :visible_pixels] = 1.0
+                self.shadow_colors[col, :visible_pixels] = colors
         else:
             top_layer = (total_pixels - 1) // height
             top_position_in_layer = (total_pixels - 1) % height
@@ -488,10 +488,10 @@ class BarsUnifiedVisualizer(BaseVisualizer):
             for j in range(visible_pixels):
                 y = height - 1 - j
                 canvas.SetPixel(col, y, r, g, b)
-                
-                if shadow_enabled:
-                    self.shadow_buffer[col, j] = 1.0
-                    self.shadow_colors[col, j] = (r, g, b)
+            
+            if shadow_enabled:
+                self.shadow_buffer[col, :visible_pixels] = 1.0
+                self.shadow_colors[col, :visible_pixels] = (r, g, b)
     
     def _draw_full(self, canvas, smoothed_bars: np.ndarray, num_bins: int, height: int) -> None:
         """
@@ -507,13 +507,15 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         bar_values = np.nan_to_num(smoothed_bars, nan=0.0)
         bar_values = np.clip(bar_values, 0.0, 1.0)
         
+        # Top and base colors of every column, one vectorized call each
+        column_ratios = np.arange(num_bins) / num_bins
+        top_colors = self.theme.get_colors_vec(1.0, column_ratios).tolist()
+        base_colors = self.theme.get_colors_vec(0.0, column_ratios).tolist()
+        
         for col in range(num_bins):
             bar_value = bar_values[col]
-            column_ratio = col / num_bins
-            
-            # Get top and base colors for this column
-            top_r, top_g, top_b = self.theme.get_color(1.0, column_ratio)
-            base_r, base_g, base_b = self.theme.get_color(0.0, column_ratio)
+            top_r, top_g, top_b = top_colors[col]
+            base_r, base_g, base_b = base_colors[col]
             
             # Calculate bar height in pixels (j index, 0=bottom)
             bar_height_px = int(bar_value * (height - 1))
@@ -549,30 +551,84 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         to top color (top), using non-gradient mode coloring (uniform
         color based on height ratio).
         """
+        # height_ratio represents how high each pixel is (0=bottom, 1=top).
+        # Use the same coloring as non-gradient mode: color is based on total
+        # bar height, which equals height_ratio here. Whole frame in one call.
+        height_ratios = np.arange(height) / (height - 1) if height > 1 else np.zeros(height)
+        column_ratios = np.arange(num_bins) / num_bins
+        colors = self.theme.get_colors_vec(height_ratios[None, :], column_ratios[:, None]).tolist()
+        
         for col in range(num_bins):
-            column_ratio = col / num_bins
-            
+            column = colors[col]
             for j in range(height):
-                y = height - 1 - j
-                # height_ratio represents how high this pixel is (0=bottom, 1=top)
-                height_ratio = j / (height - 1) if height > 1 else 0.0
-                
-                # Use the same coloring as non-gradient mode:
-                # color is based on total bar height, which equals height_ratio here
-                r, g, b = self.theme.get_color(height_ratio, column_ratio)
-                canvas.SetPixel(col, y, r, g, b)
+                r, g, b = column[j]
+                canvas.SetPixel(col, height - 1 - j, r, g, b)
+    
+    def _standard_bar_height(self, bar_value: float, height: int) -> int:
+        """Pixels lit by a standard bar (value clamped to 0-1)."""
+        return int(min(1.0, max(0.0, bar_value)) * height)
+    
+    def _overflow_total_pixels(self, raw_ratio: float, height: int) -> int:
+        """Total stacked pixels of an overflow bar (may exceed height)."""
+        return int(raw_ratio * height * self.settings.overflow.multiplier)
     
-    def _draw_shadows(self, canvas, height: int) -> None:
-        """Draw shadow pixels using sparse iteration."""
+    def _bar_coverage(
+        self,
+        smoothed_bars: np.ndarray,
+        layer_bars: Optional[List[np.ndarray]],
+        height: int
+    ) -> np.ndarray:
+        """
+        Rows per column that this frame's bars will draw, counted from the bottom.
+        
+        Mirrors the bar draw dispatch in draw() and _draw_layers() using the
+        same height helpers, so every covered pixel is repainted by a bar.
+        """
+        covered = np.zeros(self.width, dtype=np.intp)
+        if self.layers_enabled and layer_bars is not None:
+            columns = []
+            for layer_idx in self.draw_order:
+                if layer_idx >= len(layer_bars) or layer_idx >= len(self.layer_states):
+                    continue
+                state = self.layer_states[layer_idx]
+                if layer_bars[layer_idx] is None or not state.visible or not state.bars_enabled:
+                    continue
+                columns.append((layer_bars[layer_idx], state.overflow_enabled))
+        else:
+            columns = [(smoothed_bars, self.overflow_mode)]
+        
+        for bars, overflow_enabled in columns:
+            for i, raw_ratio in enumerate(bars[:self.width]):
+                if np.isnan(raw_ratio):
+                    continue
+                if overflow_enabled:
+                    rows = min(self._overflow_total_pixels(raw_ratio, height), height)
+                else:
+                    rows = self._standard_bar_height(raw_ratio, height)
+                if rows > covered[i]:
+                    covered[i] = rows
+        return covered
+    
+    def _draw_shadows(self, canvas, height: int, covered: Optional[np.ndarray] = None) -> None:
+        """
+        Draw shadow pixels using sparse iteration.
+        
+        Args:
+            canvas: RGB matrix canvas to draw on
+            height: Display height in pixels
+            covered: Optional rows per column (from the bottom) that bars will
+                     repaint this frame; shadow pixels there are skipped
+        """
         shadow_i, shadow_j = np.nonzero(self.shadow_buffer)
-        for idx in range(len(shadow_i)):
-            i, j = shadow_i[idx], shadow_j[idx]
-            shadow_val = self.shadow_buffer[i, j]
-            y = height - 1 - j
-            sc = self.shadow_colors[i, j]
-            sr = int(sc[0] * shadow_val)
-            sg = int(sc[1] * shadow_val)
-            sb = int(sc[2] * shadow_val)
+        if covered is not None:
+            visible = shadow_j >= covered[shadow_i]
+            shadow_i = shadow_i[visible]
+            shadow_j = shadow_j[visible]
+        # Fade every lit shadow pixel at once; the loop only plots
+        shadow_vals = self.shadow_buffer[shadow_i, shadow_j]
+        colors = (self.shadow_colors[shadow_i, shadow_j] * shadow_vals[:, None]).astype(np.intp)
+        ys = height - 1 - shadow_j
+        for i, y, (sr, sg, sb) in zip(shadow_i.tolist(), ys.tolist(), colors.tolist()):
             canvas.SetPixel(i, y, sr, sg, sb)
     
     def _draw_bar_standard(
@@ -587,22 +643,20 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         """Draw a standard bar (clamped to display height)."""
         # Clamp to 0-1 for standard mode
         bar_value = min(1.0, max(0.0, bar_value))
-        bar_height = int(bar_value * height)
+        bar_height = self._standard_bar_height(bar_value, height)
         
         if bar_height <= 0:
             return
         
         if self.gradient_mode:
-            # Per-pixel gradient
-            for j in range(bar_height):
-                y = height - 1 - j
-                height_ratio = j / height
-                r, g, b = self.theme.get_color(height_ratio, column_ratio)
-                canvas.SetPixel(col, y, r, g, b)
-                
-                if shadow_enabled:
-                    self.shadow_buffer[col, j] = 1.0
-                    self.shadow_colors[col, j] = (r, g, b)
+            # Per-pixel gradient: whole column in one theme call
+            colors = self.theme.get_color_column(self._row_ratios[:bar_height], column_ratio)
+            for j, (r, g, b) in enumerate(colors.tolist()):
+                canvas.SetPixel(col, height - 1 - j, r, g, b)
+            
+            if shadow_enabled:
+                self.shadow_buffer[col, :bar_height] = 1.0
+                self.shadow_colors[col, :bar_height] = colors
         else:
             # Uniform color based on bar height
             r, g, b = self.theme.get_color(bar_value, column_ratio)
@@ -610,10 +664,10 @@ class BarsUnifiedVisualizer(BaseVisualizer):
             for j in range(bar_height):
                 y = height - 1 - j
                 canvas.SetPixel(col, y, r, g, b)
-                
-                if shadow_enabled:
-                    self.shadow_buffer[col, j] = 1.0
-                    self.shadow_colors[col, j] = (r, g, b)
+            
+            if shadow_enabled:
+                self.shadow_buffer[col, :bar_height] = 1.0
+                self.shadow_colors[col, :bar_height] = (r, g, b)
     
     def _draw_bar_overflow(
         self,
@@ -625,8 +679,7 @@ class BarsUnifiedVisualizer(BaseVisualizer):
         shadow_enabled: bool
     ) -> None:
         """Draw a bar with overflow stacking."""
-        overflow = self.settings.overflow
-        total_pixels = int(raw_ratio * height * overflow.multiplier)
+        total_pixels = self._overflow_total_pixels(raw_ratio, height)
         
         if total_pixels <= 0:
             return
@@ -642,25 +695,17 @@ class BarsUnifiedVisualizer(BaseVisualizer):
             # boundary = where top layer ends (pixels 0 to boundary-1 are top layer)
             boundary = remainder if remainder > 0 else height
             
-            for j in range(visible_pixels):
-                y = height - 1 - j
-                layer_ratio = j / height
-                
-                if j < boundary:
-                    # This pixel shows the top layer
-                    layer = top_layer
-                else:
-                    # This pixel shows the layer below
-                    layer = top_layer - 1
-                
-                r, g, b = self.theme.get_overflow_color(
-                    layer, layer_ratio, column_ratio, self.frame_count, raw_ratio
-                )
-                canvas.SetPixel(col, y, r, g, b)
-                
-                if shadow_enabled:
-                    self.shadow_buffer[col, j] = 1.0
-                    self.shadow_colors[col, j] = (r, g, b)
+            # Pixels below boundary show the top layer, the rest the layer below
+            layers = np.where(self._rows[:visible_pixels] < boundary, top_layer, top_layer - 1)
+            colors = self.theme.get_overflow_color_batch(
+                layers, self._row_ratios[:visible_pixels], column_ratio, self.frame_count, raw_ratio
+            )
+            for j, (r, g, b) in enumerate(colors.tolist()):
+                canvas.SetPixel(col, height - 1 - j, r, g, b)
+            
+            if shadow_enabled:
+                self.shadow_buffer[col, :visible_pixels] = 1.0
+                self.shadow_colors[col, :visible_pixels] = colors
         else:
             # Uniform color mode: entire bar is one color
             # Color = what the top pixel would be in gradient mode
@@ -679,7 +724,7 @@ class BarsUnifiedVisualizer(BaseVisualizer):
             for j in range(visible_pixels):
                 y = height - 1 - j
                 canvas.SetPixel(col, y, r, g, b)
-                
-                if shadow_enabled:
-                    self.shadow_buffer[col, j] = 1.0
-                    self.shadow_colors[col, j] = (r, g, b)
+            
+            if shadow_enabled:
+                self.shadow_buffer[col, :visible_pixels] = 1.0
+                self.shadow_colors[col, :visible_pixels] = (r, g, b)
@@ -41,23 +41,23 @@ class BaseVisualizer(ABC):
         
         # Shadow buffer: 64x64 intensity multipliers (0-1)
         # Simple subtraction decay for fade-out effect
-        self.shadow_buffer: Optional[np.ndarray] = None
-        self.shadow_colors: Optional[np.ndarray] = None  # Store last RGB per pixel
+        # Allocated once; settings.shadow.enabled decides whether it is used
+        self.shadow_buffer: np.ndarray = np.zeros((width, height), dtype=np.float32)
+        self.shadow_colors: np.ndarray = np.zeros((width, height, 3), dtype=np.uint8)  # Store last RGB per pixel
         self.frame_count: int = 0
-        
-        if settings.shadow.enabled:
-            self.shadow_buffer = np.zeros((width, height), dtype=np.float32)
-            self.shadow_colors = np.zeros((width, height, 3), dtype=np.uint8)
     
     def decay_shadow(self) -> None:
-        """Decay shadow buffer by subtracting decay_amount (vectorized)."""
-        if self.shadow_buffer is None:
-            return
-        
+        """Decay shadow buffer by subtracting decay_amount (vectorized, in place)."""
         self.frame_count += 1
         if self.frame_count % self.settings.shadow.decay_interval == 0:
             # Vectorized subtraction, clamp to 0
-            self.shadow_buffer = np.maximum(0, self.shadow_buffer - self.settings.shadow.decay_amount)
+            np.subtract(self.shadow_buffer, self.settings.shadow.decay_amount, out=self.shadow_buffer)
+            np.maximum(self.shadow_buffer, 0, out=self.shadow_buffer)
+    
+    def reset_shadow(self) -> None:
+        """Clear shadow trails in place (e.g. when shadow mode is re-enabled)."""
+        self.shadow_buffer.fill(0)
+        self.shadow_colors.fill(0)
     
     def set_theme(self, theme: 'BaseTheme') -> None:
         """
@@ -66,6 +66,7 @@ class BaseVisualizer(ABC):
         Args:
             theme: Theme instance to use for colors
         """
+        theme.build_lut(self.width, self.height)
         self.theme = theme
     
     @abstractmethod
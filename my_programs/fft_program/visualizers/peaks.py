@@ -32,25 +32,20 @@ def draw_peaks(
         height: Display height in pixels
     """
     num_bins = len(peak_heights)
-    color_mode = settings.peak.color_mode
     
-    for i, peak_value in enumerate(peak_heights):
-        # Guard against NaN
-        if np.isnan(peak_value):
-            peak_value = 0.0
-        
-        # Clamp peak to at least 0 (bottom row) - peaks rest on floor
-        peak_y = max(0, int(min(peak_value, 1.0) * height))
-        y = height - 1 - peak_y
-        
-        if y < 0 or y >= height:
-            continue
-        
-        column_ratio = i / num_bins
-        
-        # Get peak color based on mode
-        # Use peak's own height for color reference (since we may not have bars)
-        reference_color = theme.get_color(peak_value, column_ratio)
-        pr, pg, pb = theme.get_peak_color(color_mode, reference_color, column_ratio)
-        
+    # Guard against NaN; clamp peak to at least 0 (bottom row) - peaks rest on floor
+    peak_values = np.nan_to_num(peak_heights, nan=0.0)
+    peak_ys = height - 1 - np.maximum(0, (np.minimum(peak_values, 1.0) * height).astype(np.intp))
+    
+    # Peaks at or above the top are off-screen: color only the visible ones
+    columns = np.flatnonzero(peak_ys >= 0)
+    if len(columns) == 0:
+        return
+    column_ratios = columns / num_bins
+    
+    # Use peak's own height for color reference (since we may not have bars)
+    reference_colors = theme.get_color_array(peak_values[columns], column_ratios)
+    peak_colors = theme.get_peak_color(settings.peak.color_mode, reference_colors, column_ratios)
+    
+    for i, y, (pr, pg, pb) in zip(columns.tolist(), peak_ys[columns].tolist(), peak_colors.tolist()):
         canvas.SetPixel(i, y, pr, pg, pb)
@@ -5,9 +5,10 @@ Provides a centralized way to access visualizers by name.
 """
 import sys
 import os
+import functools
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from typing import Dict, Type, List
+from typing import Dict, Type, List, Tuple
 from visualizers.base import BaseVisualizer
 from visualizers.bars_unified import BarsUnifiedVisualizer
 from visualizers.bars_dual import BarsDualVisualizer
@@ -36,6 +37,7 @@ def register_visualizer(visualizer_class: Type[BaseVisualizer]) -> None:
     if not hasattr(visualizer_class, 'name'):
         raise ValueError("Visualizer class must have a 'name' attribute")
     _VISUALIZER_REGISTRY[visualizer_class.name] = visualizer_class
+    _sorted_visualizer_names.cache_clear()
 
 
 def get_visualizer(
@@ -69,6 +71,14 @@ def get_visualizer(
     return _VISUALIZER_REGISTRY[name](width, height, settings)
 
 
+@functools.lru_cache(maxsize=1)
+def _sorted_visualizer_names() -> Tuple[str, ...]:
+    """Sorted registered visualizer names (cleared by register_visualizer)."""
+    if not _VISUALIZER_REGISTRY:
+        _register_builtin_visualizers()
+    return tuple(sorted(_VISUALIZER_REGISTRY.keys()))
+
+
 def list_visualizers() -> List[str]:
     """
     Get list of available visualizer names.
@@ -76,9 +86,7 @@ def list_visualizers() -> List[str]:
     Returns:
         Sorted list of visualizer names
     """
-    if not _VISUALIZER_REGISTRY:
-        _register_builtin_visualizers()
-    return sorted(_VISUALIZER_REGISTRY.keys())
+    return list(_sorted_visualizer_names())
 
 
 def get_visualizer_info() -> Dict[str, str]: